@@ -0,0 +1,194 @@
+import os
+import sys
+import time
+import logging
+import argparse
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Permite importar `modules.*` al ejecutar desde app/backend
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from modules import prophet_engine, ets_engine, var_engine
+
+# ======================================================
+# 🧪 BACKTESTING DE PRONÓSTICOS – FINCORTEX / HACKMTY
+# ======================================================
+# Validación cruzada con origen móvil para cada serie de
+# macro_dataset_clean.csv, repartida entre procesos. Por cada
+# backend/configuración reporta:
+#   MAPE, cobertura del intervalo, tiempo de ajuste y de predicción
+# y recomienda el modelo más rápido que sigue siendo preciso.
+# ======================================================
+
+OUTPUT_PATH = prophet_engine.DATA_PATH / "backtest_report.csv"
+
+# (nombre, backend, incertidumbre, argumentos de Prophet: "registry" = series_registry.json, "plain" = Prophet())
+# prophet_plain sirve de control: un ajuste del registro que no le gana no debería quedarse
+CONFIGS = [
+    ("prophet_sampled", "prophet", "sampled", "registry"),
+    ("prophet_analytic", "prophet", "analytic", "registry"),
+    ("prophet_plain", "prophet", "analytic", "plain"),
+    ("ets", "ets", "analytic", None),
+    ("var", "var", "analytic", None),
+]
+
+
+def _mape(actual: np.ndarray, predicted: np.ndarray) -> float:
+    mask = actual != 0
+    if not mask.any():
+        return float("nan")
+    return float(np.mean(np.abs((actual[mask] - predicted[mask]) / actual[mask])) * 100)
+
+
+def _fit_predict(serie, backend, uncertainty, config, train, future):
+    """Ajusta sin caché (para medir el costo real) y predice `future`."""
+    start = time.perf_counter()
+    if backend == "var":
+        # El VAR se ajusta con todo el panel hasta el corte (un ajuste sirve a todas las series)
+        panel = prophet_engine.macro_panel().loc[:train["ds"].iloc[-1]]
+        model = var_engine.fit(panel, len(future))
+        fit_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        forecast = var_engine.predict(model, serie, future)
+    elif backend == "ets":
+        params = ets_engine.fit(train["y"].to_numpy())
+        fit_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        step_days = train["ds"].diff().dt.days.median()
+        h = (future - train["ds"].iloc[-1]).days.to_numpy() / step_days
+        yhat, lower, upper = ets_engine.forecast(params, h)
+        forecast = pd.DataFrame({"yhat": yhat, "yhat_lower": lower, "yhat_upper": upper})
+    else:
+        model = prophet_engine._fit_model(train, config)
+        fit_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        forecast = prophet_engine._prophet_predict(
+            model, pd.DataFrame({"ds": future}), uncertainty, prophet_engine.DEFAULT_SAMPLES
+        )
+    return forecast, fit_time, time.perf_counter() - start
+
+
+def backtest_serie(serie: str, horizon: int, folds: int, step: int):
+    """Evalúa todas las configuraciones de una serie en `folds` orígenes móviles."""
+    logging.getLogger("cmdstanpy").disabled = True
+
+    df, error = prophet_engine._series_frame(serie)
+    if error:
+        return serie, [], error["error"]
+    df = df.reset_index(drop=True)
+    configs = {"registry": prophet_engine.series_config(serie)["prophet"], "plain": {}}
+
+    rows = []
+    for fold in range(folds):
+        cutoff = len(df) - horizon - fold * step
+        if cutoff < 24:
+            break
+        train, test = df.iloc[:cutoff], df.iloc[cutoff:cutoff + horizon]
+        future = pd.DatetimeIndex(test["ds"])
+        actual = test["y"].to_numpy()
+
+        for name, backend, uncertainty, prophet_args in CONFIGS:
+            try:
+                forecast, fit_time, predict_time = _fit_predict(
+                    serie, backend, uncertainty, configs.get(prophet_args), train, future
+                )
+            except Exception as e:
+                print(f"⚠️ {serie} / {name}: {e}")
+                continue
+            inside = (actual >= forecast["yhat_lower"].to_numpy()) & (actual <= forecast["yhat_upper"].to_numpy())
+            rows.append({
+                "serie": serie,
+                "config": name,
+                "fold": fold,
+                "mape": _mape(actual, forecast["yhat"].to_numpy()),
+                "coverage": float(inside.mean()),
+                "fit_s": fit_time,
+                "predict_s": predict_time,
+            })
+    return serie, rows, None
+
+
+def summarize(results: pd.DataFrame, tolerance: float) -> pd.DataFrame:
+    """Promedios por serie/configuración y la configuración recomendada.
+
+    Recomendada = la más rápida (ajuste + predicción) cuyo MAPE no supera
+    al mejor de la serie por más de `tolerance` puntos porcentuales.
+    """
+    report = (
+        results.groupby(["serie", "config"])
+        .agg(mape=("mape", "mean"), coverage=("coverage", "mean"),
+             fit_s=("fit_s", "mean"), predict_s=("predict_s", "mean"), folds=("fold", "count"))
+        .reset_index()
+    )
+    report["total_s"] = report["fit_s"] + report["predict_s"]
+
+    best_mape = report.groupby("serie")["mape"].transform("min")
+    eligible = report[report["mape"] <= best_mape + tolerance]
+    chosen = eligible.loc[eligible.groupby("serie")["total_s"].idxmin(), ["serie", "config"]]
+    report["recommended"] = report.set_index(["serie", "config"]).index.isin(
+        chosen.set_index(["serie", "config"]).index
+    )
+    return report
+
+
+def run_backtest(series=None, horizon=prophet_engine.DEFAULT_HORIZON, folds=4, step=3,
+                 workers=None, tolerance=0.5, output=OUTPUT_PATH):
+    """Corre el backtest de todas las series (o las indicadas) y guarda el reporte."""
+    if prophet_engine.get_macro_df().empty:
+        print("⚠️ No hay datos en macro_dataset_clean.csv")
+        return None
+
+    series = series or [c for c in prophet_engine.get_macro_df().columns if c != "fecha"]
+    workers = workers or os.cpu_count()
+    print(f"📂 Series: {len(series)} | Folds: {folds} | Horizonte: {horizon} | Procesos: {workers}")
+
+    start = time.time()
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(backtest_serie, serie, horizon, folds, step) for serie in series]
+        for future in as_completed(futures):
+            serie, serie_rows, error = future.result()
+            if error:
+                print(f"⚠️ {serie}: {error}")
+                continue
+            rows.extend(serie_rows)
+            print(f"✅ {serie}")
+
+    if not rows:
+        print("⚠️ No se obtuvo ningún resultado.")
+        return None
+
+    report = summarize(pd.DataFrame(rows), tolerance)
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    report.to_csv(output, index=False)
+
+    overall = report.groupby("config")[["mape", "coverage", "fit_s", "predict_s"]].median()
+    print("\n📊 Mediana por configuración:")
+    print(overall.to_string(float_format=lambda v: f"{v:.4f}"))
+    print("\n🏆 Recomendadas:")
+    print(report.loc[report["recommended"], "config"].value_counts().to_string())
+    print(f"\n✅ Reporte guardado en: {output} ({time.time() - start:.1f}s)")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backtesting con origen móvil de los pronósticos macro.")
+    parser.add_argument("--series", nargs="*", help="Series a evaluar (por defecto, todas)")
+    parser.add_argument("--horizon", type=int, default=prophet_engine.DEFAULT_HORIZON)
+    parser.add_argument("--folds", type=int, default=4)
+    parser.add_argument("--step", type=int, default=3, help="Pasos entre orígenes consecutivos")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="Puntos de MAPE tolerados frente al mejor modelo de la serie")
+    parser.add_argument("--output", default=str(OUTPUT_PATH))
+    args = parser.parse_args()
+
+    print("🚀 Iniciando backtesting de pronósticos...\n")
+    run_backtest(args.series, args.horizon, args.folds, args.step, args.workers, args.tolerance, args.output)
@@ -0,0 +1,66 @@
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+# ======================================================
+# ⏱️ ARRANQUE EN FRÍO – FINCORTEX / HACKMTY
+# ======================================================
+# Mide, en intérpretes nuevos, cuánto tarda importar el motor
+# de pronósticos y cuánto la primera lectura de datos. El import
+# debe quedar por debajo de TARGET_S: Prophet y los CSV se cargan
+# hasta que alguien los usa.
+# ======================================================
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# Objetivo de arranque de un worker (segundos)
+TARGET_S = 1.0
+
+PROBE = """
+import sys, json, time
+start = time.perf_counter()
+from modules import prophet_engine
+imported = time.perf_counter() - start
+prophet_loaded = "prophet" in sys.modules
+start = time.perf_counter()
+prophet_engine.get_macro_df()
+prophet_engine.get_kpis()
+first_access = time.perf_counter() - start
+print(json.dumps({"import_s": imported, "first_access_s": first_access, "prophet_loaded": prophet_loaded}))
+"""
+
+
+def measure_once() -> dict:
+    """Importa el motor en un proceso nuevo y devuelve los tiempos medidos."""
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def run(runs: int = 5, target: float = TARGET_S) -> bool:
+    samples = [measure_once() for _ in range(runs)]
+    import_s = statistics.median(s["import_s"] for s in samples)
+    access_s = statistics.median(s["first_access_s"] for s in samples)
+
+    print(f"📦 Import de prophet_engine (mediana de {runs}): {import_s:.3f}s")
+    print(f"📂 Primera lectura de datos: {access_s:.3f}s")
+
+    ok = import_s < target
+    if any(s["prophet_loaded"] for s in samples):
+        print("⚠️ Prophet se importó durante el arranque")
+        ok = False
+    print(f"{'✅' if ok else '❌'} Objetivo de arranque: < {target:.1f}s")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mide el arranque en frío del motor de pronósticos.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--target", type=float, default=TARGET_S, help="Segundos máximos para el import")
+    args = parser.parse_args()
+
+    sys.exit(0 if run(args.runs, args.target) else 1)
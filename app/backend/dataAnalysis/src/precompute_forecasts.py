@@ -0,0 +1,114 @@
+import os
+import sys
+import time
+import argparse
+import pandas as pd
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Permite importar `modules.*` al ejecutar desde app/backend
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from modules import prophet_engine
+
+# ======================================================
+# 🔮 PRECÁLCULO DE PRONÓSTICOS – FINCORTEX / HACKMTY
+# ======================================================
+# Ajusta todas las series de macro_dataset_clean.csv en paralelo
+# y escribe una tabla compacta (frecuencia nativa de cada serie)
+# que /forecast lee sin correr Stan:
+#   serie, ds, yhat, yhat_lower, yhat_upper, model_version
+# Con --incremental solo se reajustan las series cuyos datos
+# cambiaron, arrancando desde los parámetros del ajuste previo.
+# ======================================================
+
+
+def forecast_one(serie: str, horizon: int):
+    """Pronostica una serie dentro de un proceso del pool."""
+    df, error = prophet_engine._series_frame(serie)
+    if error:
+        return serie, None, error["error"]
+
+    preds = prophet_engine.compute_forecast(serie, horizon)
+    if isinstance(preds, dict):
+        return serie, None, preds.get("error")
+
+    rows = pd.DataFrame(preds)
+    rows.insert(0, "serie", serie)
+    rows["model_version"] = prophet_engine.model_version(serie, df)
+    return serie, rows, None
+
+
+def unchanged_rows(series, horizon, output):
+    """Filas de la tabla existente cuyas series no cambiaron desde el último cálculo."""
+    output = Path(output)
+    if not output.exists():
+        return {}
+
+    previous = pd.read_csv(output)
+    kept = {}
+    for serie, rows in previous.groupby("serie", sort=False):
+        if serie not in series or len(rows) != horizon:
+            continue
+        df, error = prophet_engine._series_frame(serie)
+        if error is None and rows["model_version"].iat[0] == prophet_engine.model_version(serie, df):
+            kept[serie] = rows
+    return kept
+
+
+def precompute_all(series=None, horizon=prophet_engine.BATCH_HORIZON, workers=None,
+                   output=prophet_engine.FORECAST_FILE, incremental=False):
+    """Pronostica todas las series (o las indicadas) y guarda la tabla."""
+    if prophet_engine.get_macro_df().empty:
+        print("⚠️ No hay datos en macro_dataset_clean.csv")
+        return None
+
+    series = series or [c for c in prophet_engine.get_macro_df().columns if c != "fecha"]
+    workers = workers or os.cpu_count()
+
+    kept = unchanged_rows(series, horizon, output) if incremental else {}
+    pending = [serie for serie in series if serie not in kept]
+    if kept:
+        print(f"♻️ Series sin cambios (se conservan): {len(kept)}")
+    print(f"📂 Series a pronosticar: {len(pending)} | Procesos: {workers}")
+
+    start = time.time()
+    tables = list(kept.values())
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(forecast_one, serie, horizon) for serie in pending]
+        for future in as_completed(futures):
+            serie, rows, error = future.result()
+            if error:
+                print(f"⚠️ {serie}: {error}")
+                continue
+            tables.append(rows)
+            print(f"✅ {serie}")
+
+    if not tables:
+        print("⚠️ No se generó ningún pronóstico.")
+        return None
+
+    table = pd.concat(tables, ignore_index=True)[prophet_engine.FORECAST_COLUMNS]
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output.with_suffix(".tmp")
+    table.to_csv(tmp, index=False)
+    os.replace(tmp, output)
+
+    print(f"\n✅ Tabla de pronósticos guardada en: {output}")
+    print(f"📊 Series: {len(tables)} | Filas: {len(table)} | Tiempo: {time.time() - start:.1f}s")
+    return table
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precalcula pronósticos de todas las series macro.")
+    parser.add_argument("--series", nargs="*", help="Series a pronosticar (por defecto, todas)")
+    parser.add_argument("--horizon", type=int, default=prophet_engine.BATCH_HORIZON)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default=str(prophet_engine.FORECAST_FILE))
+    parser.add_argument("--incremental", action="store_true",
+                        help="Solo reajusta las series cuyos datos cambiaron")
+    args = parser.parse_args()
+
+    print("🚀 Precalculando pronósticos macroeconómicos...\n")
+    precompute_all(args.series, args.horizon, args.workers, args.output, args.incremental)
@@ -1,15 +1,20 @@
 # app/backend/main.py - VERSION CON TWILIO INTELIGENTE
 from __future__ import annotations
 import os
+import re
+import json
 import base64
+import hashlib
 import tempfile
 import io
 import time
+BOOT_STARTED = time.perf_counter()
 from io import BytesIO
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pydub import AudioSegment
 from dotenv import load_dotenv
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 import speech_recognition as sr
 from gtts import gTTS
@@ -22,11 +27,24 @@ import random
 
 # === módulos internos ===
 try:
-    from modules.prophet_engine import get_kpis, predict_serie
+    from modules.prophet_engine import (get_kpis, kpi_version, data_version, latest_value, predict_serie,
+                                        predict_point, predict_many)
 except Exception as e:
     print(f"[WARNING] Prophet engine no disponible: {e}")
     def get_kpis() -> dict: return {}
-    def predict_serie(_: str) -> list: return []
+    def kpi_version() -> str: return "missing"
+    def data_version() -> str: return "missing"
+    def latest_value(_: str) -> dict: return {}
+    def predict_serie(_: str, *args, **kwargs) -> list: return []
+    def predict_point(_: str, *args, **kwargs) -> dict: return {}
+    def predict_many(_: list, **kwargs) -> dict: return {}
+
+from modules import context_gather, intent_router
+from modules.alert_dispatcher import AlertDispatcher, TwilioTransport, FakeTransport
+from modules.model_health import ModelSelector
+from modules.response_cache import get_response_cache
+from modules.prompt_builder import PromptBuilder, compact_kpis
+from modules.direct_answer import DirectAnswerer
 
 try:
     import modules.financial_advisor_v3_fixed as financial_advisor
@@ -40,19 +58,17 @@ load_dotenv()
 app = Flask(__name__)
 CORS(app)
 
-# Verificar API Key
+# Verificar API Key (sin ella el servidor arranca igual, en modo degradado)
 GEMINI_KEY = os.getenv("GEMINI_API_KEY")
 if not GEMINI_KEY:
     print("❌ ERROR: GEMINI_API_KEY no está configurada en el archivo .env")
     print("   Por favor, agrega tu API key en app/backend/.env")
-    exit(1)
-
-print(f"[Config] ✅ API Key cargada: {GEMINI_KEY[:10]}...{GEMINI_KEY[-5:]}")
-
-# Configurar Gemini con manejo de errores
-genai.configure(api_key=GEMINI_KEY)
+else:
+    print(f"[Config] ✅ API Key cargada: {GEMINI_KEY[:10]}...{GEMINI_KEY[-5:]}")
+    genai.configure(api_key=GEMINI_KEY)
 
-# Intentar con diferentes modelos hasta encontrar uno que funcione
+# Modelos en orden de preferencia: un hilo en segundo plano elige el primero que
+# responde, lo re-verifica cada LLM_HEALTH_TTL segundos y cambia si falla
 MODELS_TO_TRY = [
     "gemini-1.5-flash",
     "gemini-1.5-pro", 
@@ -61,34 +77,16 @@ MODELS_TO_TRY = [
     "gemini-2.0-flash-exp",
 ]
 
-MODEL = None
-MODEL_NAME = None
-for model_name in MODELS_TO_TRY:
-    try:
-        print(f"[Gemini] 🧪 Probando modelo: {model_name}")
-        test_model = genai.GenerativeModel(model_name)
-        # Test rápido
-        test_response = test_model.generate_content(
-            "Di solo 'ok'",
-            generation_config={"temperature": 0.7, "max_output_tokens": 10}
-        )
-        if test_response and test_response.text:
-            MODEL = test_model
-            MODEL_NAME = model_name
-            print(f"[Gemini] ✅ Modelo funcionando: {model_name}")
-            break
-    except Exception as e:
-        print(f"[Gemini] ⚠️ Modelo {model_name} falló: {str(e)[:100]}")
-        continue
-
-if MODEL is None:
-    print("❌ ERROR: No se pudo inicializar ningún modelo de Gemini")
-    print("   Verifica:")
-    print("   1. Tu API key es válida")
-    print("   2. Tienes acceso a la API en tu región")
-    print("   3. No has excedido tu cuota")
-    print("   4. Tienes conexión a internet")
-    exit(1)
+llm = ModelSelector(
+    MODELS_TO_TRY,
+    genai.GenerativeModel,
+    ttl=float(os.getenv("LLM_HEALTH_TTL", "600")),
+    enabled=bool(GEMINI_KEY),
+)
+llm.start()
+
+# Segundos que una petición espera a la primera verificación antes de responder degradada
+LLM_WAIT_S = 5.0
 
 # === TWILIO CONFIGURACIÓN ===
 TW_SID = os.getenv("TWILIO_ACCOUNT_SID")
@@ -110,10 +108,54 @@ else:
     print(f"   TOKEN: {'✅' if TW_TOKEN else '❌'}")
     print(f"   FROM: {'✅' if TW_FROM else '❌'}")
     print(f"   TO: {'✅' if TW_TO else '❌'}")
+
+# Las alertas se envían en segundo plano; ALERT_TRANSPORT=fake las guarda en memoria (pruebas)
+if os.getenv("ALERT_TRANSPORT") == "fake":
+    alert_transport = FakeTransport()
+elif tw_client:
+    alert_transport = TwilioTransport(tw_client, TW_FROM, TW_TO)
+else:
+    alert_transport = None
+alerts = AlertDispatcher(alert_transport, workers=int(os.getenv("ALERT_WORKERS", "2")))
 # ==========================================================
 
-# Cache simple
-response_cache: Dict[str, str] = {}
+# Caché de respuestas: preguntas normalizadas y casi iguales comparten respuesta
+# (memoria del proceso + SQLite compartido entre workers y reinicios)
+response_cache = get_response_cache()
+
+# Plazo (segundos) de cada proveedor de contexto antes de omitirlo del prompt
+CONTEXT_TIMEOUTS = {"kpis": 0.5, "forecast": 2.0, "empresa": 3.0}
+
+GENERATION_CONFIG = {
+    "temperature": 0.7,
+    "max_output_tokens": 250,
+    "top_p": 0.95,
+    "top_k": 40
+}
+
+# Instrucciones fijas del CFO virtual: se compactan una vez; cada petición solo
+# agrega el contexto vigente y la pregunta
+prompt_builder = PromptBuilder("ask", """
+    Eres un CFO virtual experto en finanzas mexicanas.
+    Responde de forma CONCISA y DIRECTA.
+
+    Reglas:
+    - Máximo 4 oraciones.
+    - Tono profesional, pero cercano.
+    - En español mexicano.
+""", budget=int(os.getenv("PROMPT_TOKEN_BUDGET", "800")))
+
+# Preguntas de un solo dato ("¿cuál es la tasa de referencia?"): plantilla sin LLM
+direct_answers = DirectAnswerer(
+    predict_point, latest_value, get_kpis,
+    timeout=float(os.getenv("DIRECT_ANSWER_TIMEOUT", "1.0")),
+    enabled=os.getenv("DIRECT_ANSWERS", "1") != "0",
+)
+# "¿... el próximo mes?" de las series más preguntadas, listo antes de la primera pregunta
+direct_answers.warm([s for s in os.getenv("DIRECT_ANSWER_WARM", "tipo_cambio_fix,tasa_referencia").split(",") if s])
+
+FALLBACK_ANSWER = "Disculpa, tuve un problema al procesar tu pregunta. Por favor, intenta de nuevo."
+UNAVAILABLE_ANSWER = "El asistente de IA no está disponible en este momento. Por favor, intenta de nuevo en unos minutos."
 
 # ==============================
 # 🎤 Speech-to-Text MEJORADO
@@ -209,44 +251,26 @@ def speech_to_text(file_storage):
 # ==============================
 # 🧠 Gemini con Análisis Financiero
 # ==============================
-def ask_gemini_fast(question: str) -> str:
-    """Genera respuesta con análisis financiero integrado y caché inteligente."""
-    question_lower = question.lower().strip()
-
-    skip_cache = any(word in question_lower for word in ["empresa", "negocio", "estado", "cómo va", "como va"])
-
-    if not skip_cache and question_lower in response_cache:
-        print("[Gemini] 📦 Respuesta desde cache")
-        return response_cache[question_lower]
-
-    try:
-        kpis = get_kpis()
-    except Exception:
-        kpis = {}
-
-    forecast_hint = ""
-
-    try:
-        if "tipo de cambio" in question_lower or "dólar" in question_lower:
-            preds = predict_serie("tipo_cambio_fix")
-            if preds:
-                last = preds[-1]
-                forecast_hint = f"Tipo de cambio estimado: {last['yhat']:.2f} MXN/USD para {last['ds']}."
-        elif "tasa" in question_lower or "interés" in question_lower:
-            preds = predict_serie("tasa_referencia")
-            if preds:
-                last = preds[-1]
-                forecast_hint = f"Tasa de referencia estimada: {last['yhat']:.2f}% para {last['ds']}."
-    except Exception as e:
-        print(f"[Prophet] ⚠️ {e}")
-
-    financial_context = ""
-    if FINANCIAL_ENABLED:
-        try:
-            if any(word in question_lower for word in ['empresa', 'negocio', 'ventas', 'utilidad', 'margen', 'estado', 'compañía']):
-                empresa_analysis = financial_advisor.get_advisor().analyze_empresa()
-                if empresa_analysis:
-                    financial_context += f"""
+# Series con pronóstico en el prompt, como máximo, por pregunta
+MAX_FORECAST_SERIES = 2
+
+def forecast_context(series: Tuple[str, ...]) -> str:
+    """Pista de pronóstico para las series que menciona la pregunta."""
+    hints = []
+    for serie in series[:MAX_FORECAST_SERIES]:
+        point = predict_point(serie, uncertainty="none")
+        if "yhat" in point:
+            hints.append(f"{intent_router.label(serie)} estimado: "
+                         f"{intent_router.format_value(serie, point['yhat'])} para {point['ds']:%Y-%m-%d}.")
+    return " ".join(hints)
+
+def empresa_context(empresa_analysis: Optional[Dict[str, Any]] = None) -> str:
+    """Resumen del análisis empresarial para el prompt (lo calcula si no se pasa)."""
+    if empresa_analysis is None:
+        empresa_analysis = financial_advisor.get_advisor().analyze_empresa()
+    if not empresa_analysis:
+        return ""
+    return f"""
 📊 ANÁLISIS EMPRESARIAL:
 - Estado: {empresa_analysis['estado']} (Score: {empresa_analysis['score']}/100)
 - Margen de utilidad: {empresa_analysis['metricas']['margen_utilidad']:.1f}%
@@ -254,45 +278,115 @@ def ask_gemini_fast(question: str) -> str:
 - Utilidad anual: ${empresa_analysis['metricas']['utilidad_12m']:,.0f} MXN
 - {empresa_analysis['descripcion']}
 """
-        except Exception as e:
-            print(f"[FinAdvisor] ⚠️ Error empresarial: {e}")
 
-    context = f"""Eres un CFO virtual experto en finanzas mexicanas. 
-Responde de forma CONCISA y DIRECTA.
+def is_business_question(question: str) -> bool:
+    """Preguntas sobre la empresa: su caché depende del análisis vigente."""
+    return intent_router.route(question).is_business
+
+def start_context(question: str) -> context_gather.Gathering:
+    """Lanza a la vez todo el contexto de la pregunta (KPIs, pronóstico, empresa).
 
-{financial_context}
+    Cada proveedor tiene su plazo contado desde aquí: la espera total es el plazo
+    más largo aunque `cache_scope` necesite el análisis antes que `build_prompt`.
+    """
+    routed = intent_router.route(question)
+    providers = {"kpis": (kpis_fragment, CONTEXT_TIMEOUTS["kpis"])}
+    if routed.series:
+        providers["forecast"] = (lambda: forecast_context(routed.series), CONTEXT_TIMEOUTS["forecast"])
+    if FINANCIAL_ENABLED and routed.is_business:
+        providers["empresa"] = (lambda: financial_advisor.get_advisor().analyze_empresa(),
+                                CONTEXT_TIMEOUTS["empresa"])
+    return context_gather.start(providers)
+
+def cache_scope(question: str, gathering: context_gather.Gathering) -> Optional[str]:
+    """Alcance de caché de la pregunta. None = no cachear.
+
+    Toda respuesta depende de los KPIs y de los pronósticos del prompt, así que el
+    alcance lleva la versión de ambos (sobrevive reinicios en el SQLite). Las de
+    negocio llevan además una huella de `analyze_empresa` (de `gathering`): la respuesta
+    cacheada se reutiliza hasta que cambian los números. Si el análisis no llegó
+    a tiempo o falló, no se cachea.
+    """
+    scope = f"kpis:{kpi_version()[:12]}|data:{data_version()}"
+    if not is_business_question(question):
+        return scope
+    if not FINANCIAL_ENABLED:
+        return f"{scope}|empresa:none"
 
-Datos macroeconómicos: {kpis}
-{forecast_hint}
+    analysis = gathering.get("empresa")
+    if gathering.missed("empresa"):
+        return None
+    return f"{scope}|empresa:{analysis_fingerprint(analysis or {})}"
+
+def analysis_fingerprint(analysis: Optional[Dict[str, Any]]) -> str:
+    """Huella corta del resultado de `analyze_empresa` (cambia cuando cambian los números)."""
+    return hashlib.sha1(json.dumps(analysis, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:12]
+
+def kpis_fragment() -> str:
+    """KPIs compactos, renderizados una vez por versión de kpis_macro.json."""
+    return prompt_builder.fragment("kpis", kpi_version(), lambda: compact_kpis(get_kpis() or {}))
+
+def build_prompt(question: str, gathering: context_gather.Gathering) -> Tuple[str, int]:
+    """(prompt, tokens estimados) con el contexto de `start_context` que llegue a tiempo."""
+    gathered = gathering.results()
+
+    analysis = gathered.get("empresa")
+    empresa = ""
+    if analysis:
+        # Mismo análisis → mismo fragmento ya renderizado
+        empresa = prompt_builder.fragment("empresa", analysis_fingerprint(analysis),
+                                          lambda: empresa_context(analysis))
+
+    # En orden de prioridad: si no cabe en el presupuesto, se recorta lo último
+    return prompt_builder.build(question, [
+        ("", empresa),
+        ("", gathered.get("forecast", "")),
+        ("Datos macroeconómicos", gathered.get("kpis", "")),
+    ])
+
+def cached_answer(question: str, scope: Optional[str]) -> Optional[str]:
+    """Respuesta previa para la pregunta (o una casi igual) con los mismos datos de fondo."""
+    if scope is None:
+        return None
+    answer = response_cache.get(question, scope)
+    if answer is not None:
+        print(f"[Gemini] 📦 Respuesta desde cache ({scope})")
+    return answer
 
-Reglas:
-- Máximo 4 oraciones.
-- Tono profesional, pero cercano.
-- En español mexicano.
+def remember_answer(question: str, answer: str, scope: Optional[str]):
+    if scope is not None:
+        response_cache.put(question, answer, scope)
 
-Pregunta: {question}
-"""
+def ask_gemini_fast(question: str) -> str:
+    """Genera respuesta con análisis financiero integrado y caché inteligente."""
+    direct = direct_answers.answer(question)
+    if direct is not None:
+        return direct
+
+    gathering = start_context(question)
+    scope = cache_scope(question, gathering)
+    cached = cached_answer(question, scope)
+    if cached is not None:
+        return cached
+
+    model_name, model = llm.get(wait=LLM_WAIT_S)
+    if model is None:
+        print("[Gemini] ⚠️ Sin modelo disponible (modo degradado)")
+        return UNAVAILABLE_ANSWER
+
+    context, prompt_tokens = build_prompt(question, gathering)
 
     try:
-        print("[Gemini] 🧠 Generando respuesta...")
-        generation_config = {
-            "temperature": 0.7, 
-            "max_output_tokens": 250,
-            "top_p": 0.95,
-            "top_k": 40
-        }
-        
-        resp = MODEL.generate_content(context, generation_config=generation_config)
+        print(f"[Gemini] 🧠 Generando respuesta con {model_name}...")
+        gen_start = time.time()
+        resp = model.generate_content(context, generation_config=GENERATION_CONFIG)
+        prompt_builder.record(prompt_tokens, resp, time.time() - gen_start)
         
         if not resp or not resp.text:
             raise Exception("Respuesta vacía del modelo")
             
         answer = resp.text.strip()
-
-        if not skip_cache:
-            response_cache[question_lower] = answer
-            if len(response_cache) > 100:
-                response_cache.pop(next(iter(response_cache)))
+        remember_answer(question, answer, scope)
 
         print(f"[Gemini] ✅ Respuesta generada ({len(answer)} chars)")
         return answer
@@ -301,7 +395,8 @@ Pregunta: {question}
         import traceback
         print(f"[Gemini] ❌ Error al generar respuesta: {e}")
         traceback.print_exc()
-        return "Disculpa, tuve un problema al procesar tu pregunta. Por favor, intenta de nuevo."
+        llm.report_failure(model_name, e)
+        return FALLBACK_ANSWER
 
 # ==============================
 # 🔊 Text-to-Speech
@@ -321,6 +416,109 @@ def synthesize_voice_fast(text: str) -> Optional[str]:
         print(f"[TTS] ❌ Error: {e}")
         return None
 
+# ==============================
+# 🌊 Respuesta en streaming (SSE)
+# ==============================
+# Fin de oración: . ! ? … seguido de espacio. Las oraciones muy cortas se juntan
+# con la siguiente para no pedir audio de "Sí." por separado.
+SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+MIN_SENTENCE_CHARS = 25
+
+# Audio por oración en paralelo mientras siguen llegando tokens
+_tts_pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="tts")
+
+def sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def split_sentences(buffer: str) -> Tuple[List[str], str]:
+    """Separa las oraciones completas de `buffer`; devuelve (oraciones, resto sin terminar)."""
+    parts = SENTENCE_END.split(buffer)
+    rest = parts.pop()
+    sentences, current = [], ""
+    for part in parts:
+        current = f"{current} {part}".strip()
+        if len(current) >= MIN_SENTENCE_CHARS:
+            sentences.append(current)
+            current = ""
+    if current:
+        rest = f"{current} {rest}"
+    return sentences, rest
+
+def stream_answer(question: str) -> Iterator[str]:
+    """Eventos SSE: `text` con cada fragmento del modelo, `audio` por oración y `done` al final."""
+    start_time = time.time()
+    audio_jobs = []
+    sent_audio = 0
+
+    def audio_events(wait: bool = False) -> Iterator[str]:
+        """Audios listos, en orden; con `wait` espera a todos los pendientes."""
+        nonlocal sent_audio
+        while sent_audio < len(audio_jobs):
+            sentence, job = audio_jobs[sent_audio]
+            if not wait and not job.done():
+                return
+            yield sse("audio", {"index": sent_audio, "text": sentence, "audio_base64": job.result()})
+            sent_audio += 1
+
+    yield sse("question", {"question": question})
+
+    answer, buffer, failed = "", "", False
+    model_name, stream = None, None
+    direct = direct_answers.answer(question)
+    gathering = start_context(question) if direct is None else None
+    scope = cache_scope(question, gathering) if gathering is not None else None
+    cached = direct if direct is not None else cached_answer(question, scope)
+    try:
+        if cached is not None:
+            chunks = iter([cached])
+        else:
+            model_name, model = llm.get(wait=LLM_WAIT_S)
+            if model is None:
+                print("[Gemini] ⚠️ Sin modelo disponible (modo degradado)")
+                failed = True
+                chunks = iter([UNAVAILABLE_ANSWER])
+            else:
+                print(f"[Gemini] 🌊 Generando respuesta en streaming con {model_name}...")
+                context, prompt_tokens = build_prompt(question, gathering)
+                gen_start = time.time()
+                stream = model.generate_content(context, generation_config=GENERATION_CONFIG, stream=True)
+                chunks = (chunk.text for chunk in stream)
+
+        for delta in chunks:
+            if not delta:
+                continue
+            answer += delta
+            yield sse("text", {"delta": delta})
+
+            sentences, buffer = split_sentences(buffer + delta)
+            for sentence in sentences:
+                audio_jobs.append((sentence, _tts_pool.submit(synthesize_voice_fast, sentence)))
+            yield from audio_events()
+        if stream is not None:
+            prompt_builder.record(prompt_tokens, stream, time.time() - gen_start)
+    except Exception as e:
+        print(f"[Gemini] ❌ Error en streaming: {e}")
+        failed = True
+        if model_name:
+            llm.report_failure(model_name, e)
+        if not answer:
+            answer = buffer = FALLBACK_ANSWER
+            yield sse("text", {"delta": answer})
+
+    if buffer.strip():
+        audio_jobs.append((buffer.strip(), _tts_pool.submit(synthesize_voice_fast, buffer.strip())))
+    yield from audio_events(wait=True)
+
+    answer = answer.strip()
+    if cached is None and not failed:
+        remember_answer(question, answer, scope)
+
+    elapsed = time.time() - start_time
+    yield sse("done", {"text": answer, "processing_time": f"{elapsed:.2f}s"})
+    print(f"[RESPONSE] ✅ Streaming completado en {elapsed:.2f}s ({len(audio_jobs)} audios)")
+
+    send_twilio_smart_alert(question, answer)
+
 # ==============================
 # 📱 TWILIO - RECOMENDACIONES INTELIGENTES
 # ==============================
@@ -328,7 +526,7 @@ def generate_financial_recommendation(question: str, answer: str) -> Dict[str, s
     """
     Genera una recomendación financiera inteligente basada en la pregunta y respuesta del bot.
     """
-    question_lower = question.lower()
+    intents = intent_router.route(question).intents
     answer_lower = answer.lower()
     
     # Detectar el tipo de consulta
@@ -337,7 +535,7 @@ def generate_financial_recommendation(question: str, answer: str) -> Dict[str, s
     reason = ""
     
     # 1. TIPO DE CAMBIO / DÓLAR
-    if any(word in question_lower for word in ["dólar", "tipo de cambio", "usd", "cambio"]):
+    if "tipo_cambio" in intents:
         if any(word in answer_lower for word in ["subir", "aumentar", "alza", "sube"]):
             recommendation_type = "💱 TIPO DE CAMBIO"
             recommendation = "COMPRAR DÓLARES 💵"
@@ -348,7 +546,7 @@ def generate_financial_recommendation(question: str, answer: str) -> Dict[str, s
             reason = "El tipo de cambio está estable. No es urgente comprar dólares en este momento."
     
     # 2. INFLACIÓN
-    elif any(word in question_lower for word in ["inflación", "inflacion", "precios"]):
+    elif "inflacion" in intents:
         if any(word in answer_lower for word in ["subir", "alta", "aumentar", "incremento"]):
             recommendation_type = "📈 INFLACIÓN"
             recommendation = "AJUSTAR PRECIOS +3-5% 📊"
@@ -359,7 +557,7 @@ def generate_financial_recommendation(question: str, answer: str) -> Dict[str, s
             reason = "La inflación está controlada. No es necesario ajustar precios por ahora."
     
     # 3. EMPRESA / NEGOCIO
-    elif any(word in question_lower for word in ["empresa", "negocio", "estado", "cómo va", "como va"]):
+    elif "empresa" in intents:
         if any(word in answer_lower for word in ["bien", "bueno", "positivo", "crecimiento"]):
             recommendation_type = "🏢 TU EMPRESA"
             recommendation = "INVERTIR EN CRECIMIENTO 🚀"
@@ -374,13 +572,13 @@ def generate_financial_recommendation(question: str, answer: str) -> Dict[str, s
             reason = "Tu empresa está estable. Monitorea indicadores y mantén las operaciones actuales."
     
     # 4. INVERSIÓN
-    elif any(word in question_lower for word in ["invertir", "inversión", "inversion", "donde poner"]):
+    elif "inversion" in intents:
         recommendation_type = "💼 INVERSIÓN"
         recommendation = "DIVERSIFICAR: 60% CETES + 40% ACCIONES 📈"
         reason = "Estrategia equilibrada: CETES para estabilidad (11% anual) y acciones para crecimiento."
     
     # 5. CRÉDITO / PRÉSTAMO
-    elif any(word in question_lower for word in ["crédito", "credito", "préstamo", "prestamo", "pedir prestado"]):
+    elif "credito" in intents:
         if any(word in answer_lower for word in ["bien", "puedes", "favorable", "recomiendo"]):
             recommendation_type = "💳 CRÉDITO"
             recommendation = "SOLICITAR CRÉDITO ✅"
@@ -391,19 +589,19 @@ def generate_financial_recommendation(question: str, answer: str) -> Dict[str, s
             reason = "Tu situación financiera no permite deuda adicional. Enfócate en mejorar flujo de caja primero."
     
     # 6. VENTAS / INGRESOS
-    elif any(word in question_lower for word in ["ventas", "ingresos", "vender"]):
+    elif "ventas" in intents:
         recommendation_type = "💰 VENTAS"
         recommendation = "AUMENTAR MARKETING +20% 📣"
         reason = "Invierte más en marketing digital y promociones para incrementar ventas."
     
     # 7. GASTOS
-    elif any(word in question_lower for word in ["gastos", "reducir", "ahorrar", "costos"]):
+    elif "gastos" in intents:
         recommendation_type = "💸 GASTOS"
         recommendation = "OPTIMIZAR GASTOS -10% 📉"
         reason = "Renegocia contratos con proveedores y elimina servicios no esenciales."
     
     # 8. FLUJO DE CAJA
-    elif any(word in question_lower for word in ["flujo", "caja", "liquidez", "efectivo"]):
+    elif "flujo" in intents:
         if any(word in answer_lower for word in ["bien", "positivo", "saludable"]):
             recommendation_type = "💵 FLUJO DE CAJA"
             recommendation = "INVERTIR EXCEDENTES 📈"
@@ -451,20 +649,18 @@ def generate_financial_recommendation(question: str, answer: str) -> Dict[str, s
 
 def send_twilio_smart_alert(question: str, answer: str):
     """
-    Envía una alerta inteligente por Twilio con recomendación financiera basada en la conversación.
+    Encola una alerta inteligente con recomendación financiera basada en la conversación.
+    La entrega (y sus reintentos) corre en segundo plano: no suma latencia a /ask.
     """
-    import traceback
-    
-    if not tw_client:
+    if not alerts.enabled:
         print("[Twilio] ⚠️ Cliente no inicializado. No se enviará alerta.")
         return
-    
-    try:
-        # Generar recomendación inteligente
-        rec = generate_financial_recommendation(question, answer)
-        
-        # Construir mensaje
-        msg_body = f"""🏦 FINCORTEX ALERT
+
+    # Generar recomendación inteligente
+    rec = generate_financial_recommendation(question, answer)
+
+    # Construir mensaje
+    msg_body = f"""🏦 FINCORTEX ALERT
 
 {rec['type']}
 ▶ {rec['recommendation']}
@@ -473,30 +669,12 @@ def send_twilio_smart_alert(question: str, answer: str):
 
 Pregunta: {question[:50]}..."""
 
-        # Truncar si es muy largo (límite para cuentas trial)
-        if len(msg_body) > 155:
-            msg_body = msg_body[:152] + "..."
-
-        print(f"[Twilio] 📱 Enviando alerta...")
-        print(f"[Twilio] Mensaje ({len(msg_body)} chars):\n{msg_body}\n")
+    # Truncar si es muy largo (límite para cuentas trial)
+    if len(msg_body) > 155:
+        msg_body = msg_body[:152] + "..."
 
-        msg = tw_client.messages.create(
-            body=msg_body,
-            from_=TW_FROM.strip(),
-            to=TW_TO.strip()
-        )
-
-        print(f"[Twilio] ✅ Mensaje enviado!")
-        print(f"[Twilio] SID: {msg.sid}")
-        print(f"[Twilio] Status: {msg.status}")
-        
-        if msg.error_code:
-            print(f"[Twilio] ⚠️ Error Code: {msg.error_code}")
-            print(f"[Twilio] Error: {msg.error_message}")
-
-    except Exception as e:
-        print(f"[Twilio] ❌ Error al enviar: {e}")
-        traceback.print_exc()
+    if alerts.enqueue(msg_body):
+        print(f"[Twilio] 📱 Alerta encolada ({len(msg_body)} chars)")
 
 
 # ==============================
@@ -508,15 +686,27 @@ def home() -> Any:
         "status": "ok",
         "message": "FinCortex IA con Asesor Financiero 🚀",
         "version": "3.4-twilio-smart",
-        "model": MODEL_NAME,
+        "model": llm.name,
+        "llm": llm.status(),
         "twilio": "✅ Activo" if tw_client else "❌ Inactivo",
+        "alerts": alerts.stats,
+        "response_cache": response_cache.stats(),
+        "prompt": prompt_builder.stats(),
+        "direct_answers": direct_answers.stats,
         "features": ["chat", "voice", "financial_analysis", "smart_alerts"]
     })
 
-@app.route("/ask", methods=["POST"])
-def ask() -> Any:
-    """Endpoint principal con análisis financiero y alertas Twilio inteligentes."""
-    start_time = time.time()
+@app.route("/health")
+def health() -> Any:
+    """Chequeo de vida para el balanceador: no toca modelos ni datos."""
+    return jsonify({
+        "status": "ok",
+        "uptime_s": round(time.perf_counter() - BOOT_STARTED, 1),
+        "llm": llm.status()["state"],
+    })
+
+def read_question() -> Optional[str]:
+    """Pregunta de la petición: JSON {"question"} o archivo `audio` transcrito."""
     question: Optional[str] = None
 
     print(f"\n{'='*60}\n[REQUEST] Nueva petición - {time.strftime('%H:%M:%S')}")
@@ -533,6 +723,14 @@ def ask() -> Any:
         file_bytes.filename = file.filename
         question = speech_to_text(file_bytes)
 
+    return question
+
+@app.route("/ask", methods=["POST"])
+def ask() -> Any:
+    """Endpoint principal con análisis financiero y alertas Twilio inteligentes."""
+    start_time = time.time()
+    question = read_question()
+
     if not question:
         msg = "No se pudo obtener una pregunta válida o transcribir el audio."
         print(f"[ERROR] {msg}")
@@ -542,7 +740,7 @@ def ask() -> Any:
     audio_b64 = synthesize_voice_fast(answer)
     elapsed = time.time() - start_time
 
-    # ✅ ENVIAR ALERTA INTELIGENTE POR TWILIO
+    # ✅ ALERTA INTELIGENTE POR TWILIO (se envía en segundo plano)
     send_twilio_smart_alert(question, answer)
 
     print(f"[RESPONSE] ✅ Completado en {elapsed:.2f}s\n{'='*60}\n")
@@ -553,6 +751,22 @@ def ask() -> Any:
         "processing_time": f"{elapsed:.2f}s"
     })
 
+@app.route("/ask/stream", methods=["POST"])
+def ask_stream() -> Any:
+    """Como /ask, pero en SSE: texto conforme llega y audio oración por oración."""
+    question = read_question()
+
+    if not question:
+        msg = "No se pudo obtener una pregunta válida o transcribir el audio."
+        print(f"[ERROR] {msg}")
+        return jsonify({"error": msg}), 400
+
+    return Response(
+        stream_with_context(stream_answer(question)),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 # ==============================
 # 📊 ENDPOINTS FINANCIEROS
 # ==============================
@@ -574,11 +788,46 @@ def kpis() -> Any:
     except Exception:
         return jsonify({"error": "KPIs no disponibles"}), 503
 
+def int_arg(name: str) -> Optional[int]:
+    """Parámetro entero opcional de la URL; ValueError (→ 400) si no es un entero."""
+    raw = request.args.get(name)
+    if raw is None or raw.strip() == "":
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        raise ValueError(f"'{name}' debe ser un número entero (recibido: {raw!r})") from None
+
+def forecast_options() -> Dict[str, Any]:
+    """Parámetros de pronóstico comunes a /forecast y /forecast/<serie>."""
+    return {
+        "horizon": int_arg("horizon"),
+        "freq": request.args.get("freq"),
+        "backend": request.args.get("backend"),
+        "uncertainty": request.args.get("uncertainty"),
+        "samples": int_arg("samples"),
+    }
+
 @app.route("/forecast/<serie>")
 def forecast(serie: str) -> Any:
     try:
-        preds = predict_serie(serie)
+        preds = predict_serie(serie, **forecast_options())
         return jsonify(preds)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception:
+        return jsonify({"error": "Forecast no disponible"}), 503
+
+@app.route("/forecast")
+def forecast_many() -> Any:
+    """Varias series en una sola respuesta columnar: /forecast?series=a,b,c&horizon=N"""
+    series = [s.strip() for s in request.args.get("series", "").split(",") if s.strip()]
+    if not series:
+        return jsonify({"error": "Indica las series en ?series=a,b,c"}), 400
+    try:
+        return jsonify(predict_many(series, **forecast_options()))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception:
         return jsonify({"error": "Forecast no disponible"}), 503
 
@@ -590,10 +839,11 @@ if __name__ == "__main__":
     print("🚀 FINCORTEX VOICE v3.4 - TWILIO SMART ALERTS")
     print("⚡ MODELO ESTABLE | 🎤 Audio Full | 📱 Alertas Inteligentes")
     print("="*60)
-    print(f"   - Modelo Gemini: {MODEL_NAME}")
+    print(f"   - Modelo Gemini: {llm.name or 'verificando en segundo plano...'}")
     print(f"   - Financial Advisor: {'✅ ACTIVO' if FINANCIAL_ENABLED else '❌ DESACTIVADO'}")
     print(f"   - Twilio Alerts: {'✅ ACTIVO' if tw_client else '❌ DESACTIVADO'}")
     if tw_client:
         print(f"   - Enviará SMS a: {TW_TO}")
+    print(f"   - Arranque: {time.perf_counter() - BOOT_STARTED:.2f}s")
     print("="*60 + "\n")
     app.run(debug=False, host="0.0.0.0", port=8000, threaded=True)
\ No newline at end of file
@@ -1,6 +1,7 @@
 # app/main.py - VERSION CON ASESOR FINANCIERO INTEGRADO Y DATOS REALES DE E041
 import os
 import base64
+import hashlib
 import tempfile
 import pandas as pd
 from io import BytesIO
@@ -14,8 +15,9 @@ import io
 import time
 
 # === módulos internos ===
-from modules.prophet_engine import get_kpis, predict_serie
+from modules.prophet_engine import get_kpis, kpi_version, predict_serie
 from modules.financial_advisor import get_advisor
+from modules.response_cache import get_response_cache
 
 # === configuración ===
 load_dotenv()
@@ -29,8 +31,8 @@ MODEL = genai.GenerativeModel("gemini-2.0-flash-exp")
 # Asesor financiero
 financial_advisor = get_advisor()
 
-# Cache simple
-response_cache = {}
+# Caché de respuestas compartida (memoria + SQLite entre workers y reinicios)
+response_cache = get_response_cache()
 
 # ==============================
 # 📊 CARGA DE DATOS REALES DE EMPRESA
@@ -49,6 +51,14 @@ if os.path.exists(DATA_PATH):
 else:
     print(f"[DATA] ⚠️ No se encontró archivo en {DATA_PATH}")
 
+# Huella de los datos cargados: el caché en SQLite sobrevive reinicios y no debe
+# servir consejos calculados con otros números
+EMPRESA_VERSION = "none"
+if empresa_data is not None:
+    EMPRESA_VERSION = hashlib.sha1(
+        pd.util.hash_pandas_object(empresa_data, index=False).values.tobytes()
+    ).hexdigest()[:12]
+
 # ==============================
 # 🎤 Speech-to-Text
 # ==============================
@@ -72,10 +82,12 @@ def speech_to_text(file_storage):
 # ==============================
 def ask_gemini_fast(question: str) -> str:
     """Genera respuesta usando datos reales de la empresa E041"""
-    cache_key = question.lower().strip()
-    if cache_key in response_cache:
+    # El alcance cambia con los datos de la empresa (cargados al arrancar) y con los KPIs
+    scope = f"advisor:{EMPRESA_ID}:{EMPRESA_VERSION}|kpis:{kpi_version()[:12]}"
+    cached = response_cache.get(question, scope)
+    if cached is not None:
         print("[Gemini] 📦 Respuesta desde cache")
-        return response_cache[cache_key]
+        return cached
 
     # Obtener KPIs macro
     try:
@@ -131,7 +143,7 @@ Pregunta: {question}
             generation_config={"temperature": 0.3, "max_output_tokens": 300},
         )
         answer = resp.text.strip()
-        response_cache[cache_key] = answer
+        response_cache.put(question, answer, scope)
         print(f"[Gemini] ✅ Respuesta: {answer[:80]}...")
         return answer
     except Exception as e:
@@ -0,0 +1,124 @@
+import time
+import queue
+import random
+import threading
+
+# ==========================
+# 📨 Envío de alertas en segundo plano
+# ==========================
+# Las peticiones solo encolan el mensaje; un número fijo de hilos lo entrega
+# con reintentos y espera exponencial. El transporte es intercambiable:
+# Twilio en producción, FakeTransport para pruebas locales.
+
+
+class AlertDeliveryError(RuntimeError):
+    """El transporte no pudo entregar el mensaje."""
+
+
+class TwilioTransport:
+    """Envía SMS con un cliente de Twilio ya configurado."""
+
+    def __init__(self, client, from_number: str, to_number: str):
+        self.client = client
+        self.from_number = from_number.strip()
+        self.to_number = to_number.strip()
+
+    def send(self, body: str) -> str:
+        msg = self.client.messages.create(body=body, from_=self.from_number, to=self.to_number)
+        if msg.error_code:
+            raise AlertDeliveryError(f"{msg.error_code}: {msg.error_message}")
+        return msg.sid
+
+
+class FakeTransport:
+    """Transporte local: guarda los mensajes en memoria; puede simular fallos."""
+
+    def __init__(self, failures: int = 0, delay: float = 0.0):
+        self.failures = failures
+        self.delay = delay
+        self.sent = []
+        self._lock = threading.Lock()
+
+    def send(self, body: str) -> str:
+        time.sleep(self.delay)
+        with self._lock:
+            if self.failures > 0:
+                self.failures -= 1
+                raise AlertDeliveryError("Fallo simulado")
+            self.sent.append(body)
+            return f"FAKE{len(self.sent):04d}"
+
+
+class AlertDispatcher:
+    """Cola en memoria + hilos de envío con concurrencia acotada y reintentos."""
+
+    def __init__(self, transport, workers: int = 2, max_retries: int = 3,
+                 backoff: float = 1.0, max_queue: int = 100):
+        self.transport = transport
+        self.workers = workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._started = False
+        self.stats = {"queued": 0, "sent": 0, "retried": 0, "failed": 0, "dropped": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.transport is not None
+
+    def enqueue(self, body: str) -> bool:
+        """Encola el mensaje sin bloquear; False si no hay transporte o la cola está llena."""
+        if not self.enabled:
+            return False
+        self._start()
+        try:
+            self._queue.put_nowait(body)
+        except queue.Full:
+            self._count("dropped")
+            print("[Alerts] ⚠️ Cola llena, alerta descartada")
+            return False
+        self._count("queued")
+        return True
+
+    def join(self):
+        """Espera a que se procesen todas las alertas encoladas (útil en pruebas)."""
+        self._queue.join()
+
+    def _start(self):
+        with self._lock:
+            if self._started:
+                return
+            for n in range(self.workers):
+                threading.Thread(target=self._run, name=f"alerts-{n}", daemon=True).start()
+            self._started = True
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _run(self):
+        while True:
+            body = self._queue.get()
+            try:
+                self._deliver(body)
+            finally:
+                self._queue.task_done()
+
+    def _deliver(self, body: str):
+        for attempt in range(self.max_retries + 1):
+            try:
+                sid = self.transport.send(body)
+                self._count("sent")
+                print(f"[Alerts] ✅ Alerta enviada (SID: {sid})")
+                return
+            except Exception as e:
+                if attempt == self.max_retries:
+                    self._count("failed")
+                    print(f"[Alerts] ❌ Alerta no entregada tras {attempt + 1} intentos: {e}")
+                    return
+                # Espera exponencial con variación aleatoria para no reintentar en bloque
+                delay = self.backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+                self._count("retried")
+                print(f"[Alerts] ⚠️ Intento {attempt + 1} falló ({e}); reintento en {delay:.1f}s")
+                time.sleep(delay)
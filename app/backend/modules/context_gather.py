@@ -0,0 +1,65 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+# ==========================
+# 🧩 Contexto en paralelo para el prompt
+# ==========================
+# Cada proveedor (KPIs, pronósticos, análisis financiero...) corre en su propio
+# hilo con un plazo. El que no responde a tiempo o falla se omite del prompt:
+# la espera total queda acotada por el plazo más largo, no por la suma.
+# Un proveedor que se pasa sigue corriendo y deja calientes sus cachés para
+# la siguiente pregunta.
+
+_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="context")
+
+
+class Gathering:
+    """Proveedores ya lanzados; cada uno se espera como máximo hasta su plazo desde el arranque."""
+
+    def __init__(self, providers: dict):
+        self.start = time.monotonic()
+        self._futures = {name: (_pool.submit(fn), timeout) for name, (fn, timeout) in providers.items()}
+        self._results = {}
+        self._missed = set()
+
+    def _wait(self, name: str):
+        if name in self._results or name in self._missed or name not in self._futures:
+            return
+        future, timeout = self._futures[name]
+        remaining = max(0.0, self.start + timeout - time.monotonic())
+        try:
+            self._results[name] = future.result(timeout=remaining)
+        except TimeoutError:
+            self._missed.add(name)
+            print(f"[Context] ⏱️ {name} no respondió en {timeout:g}s, se omite")
+        except Exception as e:
+            self._missed.add(name)
+            print(f"[Context] ⚠️ {name}: {e}")
+
+    def get(self, name: str, default=None):
+        """Resultado de `name` (esperando hasta su plazo) o `default` si no llegó."""
+        self._wait(name)
+        return self._results.get(name, default)
+
+    def missed(self, name: str) -> bool:
+        """True si `name` se lanzó y no llegó a tiempo o falló."""
+        self._wait(name)
+        return name in self._missed
+
+    def results(self) -> dict:
+        """Espera al resto y devuelve {nombre: resultado} de los que llegaron."""
+        for name in self._futures:
+            self._wait(name)
+        print(f"[Context] 🧩 {len(self._results)}/{len(self._futures)} proveedores "
+              f"en {time.monotonic() - self.start:.2f}s")
+        return dict(self._results)
+
+
+def start(providers: dict) -> Gathering:
+    """Lanza {nombre: (función, plazo_s)} en paralelo sin esperar a ninguno."""
+    return Gathering(providers)
+
+
+def gather(providers: dict) -> dict:
+    """Ejecuta {nombre: (función, plazo_s)} en paralelo; devuelve {nombre: resultado} de los que llegaron."""
+    return start(providers).results()
@@ -0,0 +1,175 @@
+import re
+import time
+import threading
+
+import pandas as pd
+
+from modules import context_gather, intent_router
+
+# ==========================
+# ⚡ Respuestas directas sin LLM
+# ==========================
+# "¿A cuánto estará el dólar el próximo mes?" o "¿cuál es la tasa de
+# referencia?" se responden con un solo número: el pronóstico cacheado, el
+# último dato observado o un KPI. Si el router detecta una pregunta así (un
+# dato, una sola serie, sin pedir opinión), la respuesta sale de una plantilla
+# en milisegundos. Si el dato no está listo dentro del plazo, la pregunta
+# sigue por el camino normal del LLM.
+
+# Intenciones que piden análisis, consejo o un supuesto, no un dato
+ADVICE_INTENTS = frozenset({"opinion", "condicional", "empresa", "ventas", "inversion", "credito", "gastos",
+                            "flujo"})
+
+# "¿Cuál será la tasa?" sin plazo: se contesta para dentro de un mes a partir de hoy
+DEFAULT_AHEAD = pd.DateOffset(months=1)
+
+# Series cuyo "dato actual" es un KPI del pipeline y no el último nivel observado
+KPI_ANSWERS = {
+    "inpc_general": ("inflacion_promedio_mensual", "La inflación promedio mensual es de {value:.2f}%."),
+    "pib_trimestral_desestacionalizado": ("variacion_pib_anual_%", "La variación anual del PIB es de {value:.1f}%."),
+}
+
+NUMBER_WORDS = {"un": 1, "una": 1, "uno": 1, "dos": 2, "tres": 3, "cuatro": 4, "cinco": 5, "seis": 6,
+                "siete": 7, "ocho": 8, "nueve": 9, "diez": 10, "once": 11, "doce": 12}
+
+# "en 3 meses", "dentro de dos semanas", "el próximo año", "mañana" (texto ya normalizado).
+# Solo cuenta como plazo tras una preposición de tiempo: "cetes a 28 días" es el
+# plazo del instrumento, no la fecha que se pide
+HORIZON = re.compile(r"\b(?:en|dentro de|a partir de|de aqui a) (?:(?:los|las|unos|unas) )?"
+                     r"(\d+|" + "|".join(NUMBER_WORDS) + r") (dia|dias|semana|semanas|mes|meses|ano|anos)\b")
+NEXT = re.compile(r"\b(?:proximo|siguiente) (dia|semana|mes|ano)\b|\b(dia|semana|mes|ano) que viene\b")
+# Plazo de un instrumento ("cetes a 91 días")
+TENOR = re.compile(r"\ba (\d+) dias\b")
+UNIT_OFFSETS = {"dia": "days", "dias": "days", "semana": "weeks", "semanas": "weeks",
+                "mes": "months", "meses": "months", "ano": "years", "anos": "years"}
+
+
+def _is_tenor(serie: str, amount: int, unit: str) -> bool:
+    """"28 días" en una pregunta de cetes_28d/tiie_28d es el plazo de la serie."""
+    return serie is not None and unit.startswith("dia") and str(amount) in re.findall(r"\d+", serie)
+
+
+def asks_other_tenor(text: str, serie: str) -> bool:
+    """La pregunta pide un plazo que la serie no tiene ("cetes a 91 días" con solo cetes_28d)."""
+    return any(not _is_tenor(serie, int(days), "dias") for days in TENOR.findall(text))
+
+
+def target_date(text: str, today: pd.Timestamp = None, serie: str = None):
+    """Fecha que pide la pregunta (texto normalizado), o None si no menciona un plazo."""
+    today = (today or pd.Timestamp.today()).normalize()
+    if re.search(r"\bmanana\b", text):
+        return today + pd.DateOffset(days=1)
+
+    for match in HORIZON.finditer(text):
+        amount = int(match.group(1)) if match.group(1).isdigit() else NUMBER_WORDS[match.group(1)]
+        unit = match.group(2)
+        if not _is_tenor(serie, amount, unit):
+            return today + pd.DateOffset(**{UNIT_OFFSETS[unit]: amount})
+
+    match = NEXT.search(text)
+    if not match:
+        return None
+    return today + pd.DateOffset(**{UNIT_OFFSETS[match.group(1) or match.group(2)]: 1})
+
+
+def default_target(today: pd.Timestamp = None) -> pd.Timestamp:
+    """Fecha de un pronóstico sin plazo explícito: un mes después de hoy."""
+    return (today or pd.Timestamp.today()).normalize() + DEFAULT_AHEAD
+
+
+class DirectAnswerer:
+    """Responde preguntas de un solo dato con plantillas, a partir de pronósticos y KPIs."""
+
+    def __init__(self, predict_point, latest_value, get_kpis, timeout: float = 1.0, enabled: bool = True):
+        self.predict_point = predict_point
+        self.latest_value = latest_value
+        self.get_kpis = get_kpis
+        self.timeout = timeout
+        self.enabled = enabled
+        self.stats = {"answered": 0, "skipped": 0, "missing": 0}
+        self._lock = threading.Lock()
+
+    def warm(self, series):
+        """Calcula en segundo plano el pronóstico a un mes de `series`.
+
+        Un predict_point en frío (arrancar el worker, cargar el modelo) tarda más
+        que `timeout`: sin esto, el primer "¿... el próximo mes?" iría al LLM.
+        """
+        if not self.enabled:
+            return
+
+        def run():
+            target = default_target()
+            for serie in series:
+                try:
+                    self.predict_point(serie, target, uncertainty="analytic")
+                except Exception as e:
+                    print(f"[Direct] ⚠️ No se pudo precalentar {serie}: {e}")
+
+        threading.Thread(target=run, name="direct-warm", daemon=True).start()
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def eligible(self, routed) -> bool:
+        """Una sola serie, pide un dato y no pide opinión ni consejo."""
+        return (self.enabled and len(routed.series) == 1 and "dato" in routed.intents
+                and not routed.intents & ADVICE_INTENTS)
+
+    def answer(self, question: str):
+        """Respuesta de plantilla o None (la pregunta debe ir al LLM)."""
+        routed = intent_router.route(question)
+        if not self.eligible(routed) or asks_other_tenor(routed.text, routed.serie):
+            self._count("skipped")
+            return None
+
+        start = time.time()
+        serie = routed.serie
+        target = target_date(routed.text, serie=serie)
+        if target is None and "pronostico" in routed.intents:
+            target = default_target()
+        if target is not None:
+            compute = lambda: self._forecast(serie, target)
+        else:
+            compute = lambda: self._current(serie)
+
+        # Con plazo: si el pronóstico no está cacheado se sigue calculando y
+        # calienta la caché, pero esta pregunta se va al LLM
+        text = context_gather.gather({"direct": (compute, self.timeout)}).get("direct")
+        if not text:
+            self._count("missing")
+            return None
+        self._count("answered")
+        print(f"[Direct] ⚡ {serie} respondida sin LLM en {(time.time() - start) * 1000:.0f}ms")
+        return text
+
+    # --------------------------
+    # 🧾 Plantillas
+    # --------------------------
+    def _forecast(self, serie: str, target):
+        point = self.predict_point(serie, target, uncertainty="analytic")
+        # Un "pronóstico" con fecha pasada no responde la pregunta
+        if "yhat" not in point or pd.Timestamp(point["ds"]) <= pd.Timestamp.today().normalize():
+            return None
+
+        name = intent_router.label(serie)
+        text = (f"{name} se estima en {intent_router.format_value(serie, point['yhat'])} "
+                f"para el {pd.Timestamp(point['ds']):%d/%m/%Y}.")
+        if point.get("yhat_lower") is not None and point.get("yhat_upper") is not None:
+            text += (f" El rango probable va de {intent_router.format_value(serie, point['yhat_lower'])} "
+                     f"a {intent_router.format_value(serie, point['yhat_upper'])}.")
+        return text
+
+    def _current(self, serie: str):
+        if serie in KPI_ANSWERS:
+            key, template = KPI_ANSWERS[serie]
+            value = (self.get_kpis() or {}).get(key)
+            if isinstance(value, (int, float)):
+                return template.format(value=value)
+
+        last = self.latest_value(serie)
+        if "y" not in last:
+            return None
+        return (f"{intent_router.label(serie)} está en {intent_router.format_value(serie, last['y'])} "
+                f"(último dato: {pd.Timestamp(last['ds']):%d/%m/%Y}).")
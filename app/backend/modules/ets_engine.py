@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+
+# ==========================
+# 📉 Suavizamiento exponencial (NumPy puro)
+# ==========================
+# Holt con tendencia amortiguada, ETS(A,Ad,N). Para parámetros fijos, los
+# errores a un paso y el estado final son lineales en las observaciones,
+# así que la rejilla completa se evalúa con un solo producto matriz-vector
+# contra operadores precalculados. Los intervalos son analíticos.
+
+# Rejilla de parámetros: beta se expresa como fracción de alpha (beta <= alpha)
+ALPHAS = np.array([0.1, 0.3, 0.5, 0.7, 0.9])
+BETA_FRACTIONS = np.array([0.0, 0.05, 0.2, 0.5])
+PHIS = np.array([0.8, 0.9, 0.98])
+
+# Solo las últimas observaciones pesan en la estimación
+WINDOW = 120
+
+# z para un intervalo del 80% (mismo ancho por defecto que Prophet)
+Z_80 = 1.2815515655446004
+
+_GRID = np.array(np.meshgrid(ALPHAS, BETA_FRACTIONS, PHIS, indexing="ij")).reshape(3, -1)
+_ALPHA = _GRID[0]
+_BETA = _GRID[0] * _GRID[1]
+_PHI = _GRID[2]
+
+
+@lru_cache(maxsize=4)
+def _operators(n: int) -> tuple:
+    """Operadores lineales (errores a un paso, nivel y tendencia finales) para n datos."""
+    eye = np.eye(n)
+    level = np.tile(eye[0], (_ALPHA.size, 1))
+    trend = np.tile(eye[1] - eye[0], (_ALPHA.size, 1))
+    errors = np.empty((_ALPHA.size, n - 1, n))
+
+    alpha, beta, phi = _ALPHA[:, None], _BETA[:, None], _PHI[:, None]
+    for t in range(1, n):
+        damped = phi * trend
+        err = eye[t] - (level + damped)
+        errors[:, t - 1] = err
+        level = level + damped + alpha * err
+        trend = damped + beta * err
+
+    return errors, level, trend
+
+
+def fit(y: np.ndarray) -> dict:
+    """Elige (alpha, beta, phi) por mínimo SSE a un paso y devuelve el estado final."""
+    y = np.asarray(y, dtype=float)[-WINDOW:]
+    errors, level, trend = _operators(len(y))
+
+    sse = np.square(errors @ y).sum(axis=1)
+    best = int(np.argmin(sse))
+    return {
+        "alpha": float(_ALPHA[best]),
+        "beta": float(_BETA[best]),
+        "phi": float(_PHI[best]),
+        "level": float(level[best] @ y),
+        "trend": float(trend[best] @ y),
+        "sigma2": float(sse[best] / max(len(y) - 1, 1)),
+    }
+
+
+def _variance(params: dict, h: np.ndarray) -> np.ndarray:
+    """Varianza analítica del error a h pasos para ETS(A,Ad,N)."""
+    a, b, phi = params["alpha"], params["beta"], params["phi"]
+    one_minus = 1 - phi
+    term1 = a * a * (h - 1)
+    term2 = b * phi * h / one_minus ** 2 * (2 * a * one_minus + b * phi)
+    term3 = (b * phi * (1 - phi ** h) / (one_minus ** 2 * (1 - phi * phi))
+             * (2 * a * (1 - phi * phi) + b * phi * (1 + 2 * phi - phi ** h)))
+    return params["sigma2"] * np.maximum(1 + term1 + term2 - term3, 1.0)
+
+
+def forecast(params: dict, h: np.ndarray) -> tuple:
+    """Pronóstico puntual e intervalo del 80% a `h` pasos (h puede ser fraccional)."""
+    h = np.asarray(h, dtype=float)
+    phi = params["phi"]
+    damp_sum = phi * (1 - phi ** h) / (1 - phi)
+    yhat = params["level"] + params["trend"] * damp_sum
+    width = Z_80 * np.sqrt(_variance(params, h))
+    return yhat, yhat - width, yhat + width
+
+
+def predict(df: pd.DataFrame, future: pd.DatetimeIndex) -> pd.DataFrame:
+    """Mismo contrato que el pronóstico de Prophet para las fechas `future`."""
+    step_days = df["ds"].diff().dt.days.median()
+    last = df["ds"].iloc[-1]
+
+    params = fit(df["y"].to_numpy())
+    h = (future - last).days.to_numpy() / step_days
+    yhat, lower, upper = forecast(params, h)
+    return pd.DataFrame({"ds": future, "yhat": yhat, "yhat_lower": lower, "yhat_upper": upper})
@@ -0,0 +1,210 @@
+import os
+import sys
+import time
+import queue
+import signal
+import importlib
+import threading
+import subprocess
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from multiprocessing.connection import Connection, Pipe
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# ==========================
+# 🏭 Workers de pronóstico fuera del proceso web
+# ==========================
+# Los ajustes de Prophet corren en procesos hijos persistentes, alimentados por
+# una cola local. Cada trabajo tiene límite de tiempo y cada hijo un tope de
+# memoria (RLIMIT_AS): si se pasa, se mata el hijo y se levanta otro, sin
+# tocar al proceso web. Cualquier fallo al enviar o recibir (un resultado que
+# no se puede deserializar, el hijo que muere) reemplaza al hijo y falla el
+# Future: el hilo despachador nunca muere con un trabajo a medias. Los hijos
+# se lanzan con `python -m` (no con fork), así que no heredan hilos ni vuelven
+# a ejecutar main.py.
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Solo en POSIX: socketpair heredado por el hijo + RLIMIT_AS
+SUPPORTED = os.name == "posix"
+
+
+class ForecastJobError(RuntimeError):
+    """El trabajo no terminó: tiempo agotado, memoria o el worker murió."""
+
+
+class _Worker:
+    """Proceso hijo y su extremo de la conexión."""
+
+    def __init__(self, memory_mb):
+        parent_conn, child_conn = Pipe()
+        env = {**os.environ, "FORECAST_WORKERS": "0", "OPENBLAS_NUM_THREADS": "1"}
+        if memory_mb:
+            env["FORECAST_JOB_MEMORY_MB"] = str(memory_mb)
+
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "modules.forecast_worker", str(child_conn.fileno())],
+            cwd=BACKEND_DIR,
+            env=env,
+            pass_fds=(child_conn.fileno(),),
+            start_new_session=True,  # grupo propio: al matarlo cae también Stan
+        )
+        child_conn.close()
+        self.conn = parent_conn
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def kill(self):
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        self.process.wait()
+        self.conn.close()
+
+
+class ForecastWorkerPool:
+    """Pool de procesos hijos persistentes con cola de trabajos y límites por trabajo.
+
+    Los procesos se lanzan en el primer `submit`, así que crear el pool no cuesta nada.
+    """
+
+    def __init__(self, processes: int = 1, timeout: float = 60.0, memory_mb: int = None):
+        self.processes = processes if SUPPORTED else 0
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self._jobs = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = False
+        self._threads = []
+
+    @property
+    def enabled(self) -> bool:
+        return self.processes > 0
+
+    def submit(self, module: str, func: str, *args, **kwargs) -> Future:
+        """Encola `module.func(*args, **kwargs)`; el resultado llega en el Future."""
+        self._start()
+        future = Future()
+        self._jobs.put((future, module, func, args, kwargs))
+        return future
+
+    def result(self, future: Future, margin: float = 5.0):
+        """Resultado de `future` sin bloquear para siempre.
+
+        En cola se espera (cada trabajo en curso tiene su propio límite); ya en
+        curso, como máximo `timeout + margin` desde que arrancó.
+        """
+        limit = self.timeout + margin
+        while True:
+            try:
+                return future.result(timeout=limit)
+            except FutureTimeout:
+                started = getattr(future, "started_at", None)
+                if started is not None and time.monotonic() - started > limit:
+                    raise ForecastJobError(f"Sin respuesta del worker de pronósticos tras {limit:g}s")
+                if not any(thread.is_alive() for thread in self._threads):
+                    raise ForecastJobError("No hay workers de pronósticos activos")
+
+    def _start(self):
+        with self._lock:
+            if self._started:
+                return
+            for slot in range(self.processes):
+                thread = threading.Thread(target=self._dispatch, name=f"forecast-worker-{slot}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            self._started = True
+            print(f"[Workers] 🏭 {self.processes} proceso(s) de pronóstico "
+                  f"(límite {self.timeout:g}s, {self.memory_mb or '∞'} MB)")
+
+    def _dispatch(self):
+        """Hilo despachador: un proceso hijo y un trabajo a la vez."""
+        worker = None
+        while True:
+            future, module, func, args, kwargs = self._jobs.get()
+            future.started_at = time.monotonic()
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                if worker is None or not worker.alive():
+                    worker = _Worker(self.memory_mb)
+                worker.conn.send((module, func, args, kwargs))
+                if not worker.conn.poll(self.timeout):
+                    worker.kill()
+                    worker = None
+                    future.set_exception(ForecastJobError(f"{func} excedió {self.timeout:g}s"))
+                    continue
+                ok, value = worker.conn.recv()
+            except (EOFError, OSError) as e:
+                if worker is not None:
+                    worker.kill()
+                worker = None
+                future.set_exception(ForecastJobError(f"El worker de pronósticos terminó: {e}"))
+                continue
+            except Exception as e:
+                # Argumentos o respuesta que no se pueden (de)serializar: la
+                # conexión queda en un estado incierto, así que se cambia de hijo
+                if worker is not None:
+                    worker.kill()
+                worker = None
+                future.set_exception(ForecastJobError(f"{func}: fallo al comunicarse con el worker: {e!r}"))
+                continue
+
+            if ok:
+                future.set_result(value)
+                continue
+
+            if isinstance(value, MemoryError):
+                # El hijo puede quedar fragmentado: se reemplaza por uno limpio
+                worker.kill()
+                worker = None
+                value = ForecastJobError(f"{func} excedió {self.memory_mb} MB")
+            future.set_exception(value)
+
+
+# ==========================
+# 👷 Proceso hijo
+# ==========================
+def _limit_memory():
+    memory_mb = int(os.getenv("FORECAST_JOB_MEMORY_MB", "0"))
+    if memory_mb and resource is not None:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _serve(conn: Connection):
+    """Atiende trabajos hasta que el proceso web cierre la conexión."""
+    while True:
+        try:
+            module, func, args, kwargs = conn.recv()
+        except (EOFError, OSError):
+            return
+
+        try:
+            result = (True, getattr(importlib.import_module(module), func)(*args, **kwargs))
+        except BaseException as e:
+            result = (False, e)
+
+        try:
+            conn.send(result)
+        except (EOFError, OSError):
+            return
+        except Exception as e:
+            # Resultado o excepción que no se puede serializar
+            conn.send((False, ForecastJobError(f"{func}: {e}")))
+
+
+if __name__ == "__main__":
+    # Se usa el módulo importado (no __main__) para que las excepciones
+    # enviadas al proceso web se puedan deserializar allá
+    from modules import forecast_worker
+
+    forecast_worker._limit_memory()
+    forecast_worker._serve(Connection(int(sys.argv[1])))
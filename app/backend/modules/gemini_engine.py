@@ -1,7 +1,11 @@
 import os
-import json
+import time
 import google.generativeai as genai
-from modules.prophet_engine import get_kpis, predict_serie
+from modules.prophet_engine import get_kpis, kpi_version, data_version, predict_point
+from modules import intent_router
+from modules.model_health import ModelSelector
+from modules.response_cache import get_response_cache
+from modules.prompt_builder import PromptBuilder, compact_kpis
 
 # ==========================
 # ⚙️ Configuración de Gemini
@@ -17,32 +21,32 @@ else:
     print("✅ [CONFIG] GEMINI_API_KEY detectada:", GEMINI_KEY[:8] + "********")
     genai.configure(api_key=GEMINI_KEY)
 
-# Usa el modelo correcto (sin 'models/')
-MODEL_NAME = "gemini-2.5-pro"
-print(f"🧩 [MODEL] Intentando inicializar modelo: {MODEL_NAME}")
+# Modelos en orden de preferencia (sin 'models/'). Se verifican en segundo
+# plano: importar este módulo ya no hace llamadas de prueba a Gemini.
+MODELS_TO_TRY = ["gemini-2.5-pro", "gemini-2.5-flash"]
 
-try:
-    MODEL = genai.GenerativeModel(MODEL_NAME)
-    print(f"✅ [MODEL] Modelo '{MODEL_NAME}' inicializado correctamente.")
-except Exception as e:
-    print(f"❌ [MODEL INIT ERROR] No se pudo inicializar el modelo '{MODEL_NAME}': {e}")
-    MODEL = None
+llm = ModelSelector(MODELS_TO_TRY, genai.GenerativeModel, enabled=bool(GEMINI_KEY))
+llm.start()
 
-# ==========================
-# 🔍 Verificación inicial (conexión de prueba)
-# ==========================
-if MODEL:
-    try:
-        print("🧪 [TEST] Enviando prueba a Gemini...")
-        test_resp = MODEL.generate_content("Hola, Gemini. Prueba de conexión del servidor financiero.")
-        if test_resp and hasattr(test_resp, "text"):
-            print("✅ [TEST] Conexión con Gemini OK. Respuesta:", test_resp.text[:80], "...")
-        else:
-            print("⚠️ [TEST] Gemini respondió sin texto. Revisa tu cuota o el modelo.")
-    except Exception as e:
-        print(f"🚨 [Gemini Startup Error] {e}")
-else:
-    print("⚠️ [INIT] No se pudo crear instancia de Gemini; modelo es None.")
+# Caché compartida con main.py; el alcance separa las respuestas de este prompt
+response_cache = get_response_cache()
+
+# Instrucciones fijas del asistente: se compactan una sola vez, no en cada pregunta
+prompt_builder = PromptBuilder("engine", """
+Eres FinCortex, un CFO virtual especializado en análisis financiero y proyecciones económicas:
+ayudas a interpretar datos macroeconómicos y pronósticos de Prophet, y conversas con naturalidad
+si el tema no es financiero.
+
+Si la pregunta es de finanzas o economía (tasas, inflación, PIB, tipo de cambio, mercado, proyecciones):
+- Básate solo en el pronóstico y los KPIs dados; no inventes cifras ni amplíes rangos.
+- Si hay un pronóstico estimado, úsalo como valor principal y explica brevemente el razonamiento sin alterarlo.
+- Tono de asesor confiable: profesional, claro y conciso (máximo 3 párrafos cortos).
+
+Si no es financiera: responde de forma natural, empática y cercana. A un saludo, saluda y ofrece
+ayuda con proyecciones, indicadores o dudas de finanzas.
+
+Siempre: breve, claro y cortés; sin respuestas repetitivas, sin citar el contexto ni repetir instrucciones.
+""", budget=int(os.getenv("PROMPT_TOKEN_BUDGET", "800")))
 
 # ==========================
 # 🧠 Función principal
@@ -51,6 +55,13 @@ def ask_gemini(question: str) -> str:
     """Genera una respuesta en contexto financiero usando Gemini + Prophet."""
     print(f"\n💬 [ASK] Recibida pregunta: {question}")
 
+    # El prompt lleva KPIs y un pronóstico: el alcance cambia con ambas versiones
+    scope = f"engine|kpis:{kpi_version()[:12]}|data:{data_version()}"
+    cached = response_cache.get(question, scope)
+    if cached is not None:
+        print("📦 [Cache] Respuesta desde cache")
+        return cached
+
     kpis_macro = get_kpis()
     forecast_hint = ""
 
@@ -58,76 +69,44 @@ def ask_gemini(question: str) -> str:
     # 🔎 Intentar incluir contexto de predicciones
     # --------------------------
     try:
-        if "tipo de cambio" in question.lower():
-            preds = predict_serie("tipo_cambio_fix")
-            if isinstance(preds, list) and preds:
-                last = preds[-1]
-                forecast_hint = f"El tipo de cambio se estima en {last['yhat']:.2f} MXN/USD para {last['ds']}."
-        elif "tasa" in question.lower():
-            preds = predict_serie("tasa_referencia")
-            if isinstance(preds, list) and preds:
-                last = preds[-1]
-                forecast_hint = f"La tasa de referencia podría ser {last['yhat']:.2f}% para {last['ds']}."
-        elif "ipc" in question.lower():
-            preds = predict_serie("ipc_bmv")
-            if isinstance(preds, list) and preds:
-                last = preds[-1]
-                forecast_hint = f"El IPC de la Bolsa Mexicana se estima en {last['yhat']:.2f} puntos para {last['ds']}."
+        serie = intent_router.route(question).serie
+        if serie:
+            point = predict_point(serie, uncertainty="none")
+            if "yhat" in point:
+                forecast_hint = (f"{intent_router.label(serie)} se estima en "
+                                 f"{intent_router.format_value(serie, point['yhat'])} para {point['ds']:%Y-%m-%d}.")
     except Exception as e:
         print(f"[Gemini Context Error] {e}")
 
     # --------------------------
-    # 📋 Crear contexto para Gemini
+    # 📋 Contexto vigente (las instrucciones ya están precompiladas)
     # --------------------------
-    context = f"""
-    Contexto macroeconómico:
-    {json.dumps(kpis_macro, indent=2, ensure_ascii=False)}
-
-    {forecast_hint if forecast_hint else "Sin pronósticos recientes disponibles."}
-Instrucciones para el asistente:
-
-Eres un CFO virtual llamado FinCortex, especializado en análisis financiero y proyecciones económicas.
-Tu objetivo es ayudar a usuarios a interpretar datos macroeconómicos y resultados de modelos Prophet,
-pero también mantener una conversación natural si el tema no es financiero.
-
-Comportamiento:
-
-1. **Si la pregunta está relacionada con finanzas, economía, tasas, inflación, PIB, tipo de cambio, mercado o proyecciones:**
-   - Basa tus respuestas exclusivamente en los datos proporcionados por Prophet y los KPIs disponibles.
-   - No inventes cifras ni amplíes rangos.
-   - Si existe un valor estimado (`forecast_hint`), úsalo como el pronóstico principal.
-   - Explica brevemente el razonamiento financiero detrás, sin alterar el valor numérico.
-   - Mantén un tono profesional, claro y conciso (máximo 3 párrafos cortos).
-   - Habla como un asesor financiero confiable que da contexto técnico sin extenderse innecesariamente.
-
-2. **Si la pregunta NO está relacionada con temas financieros:**
-   - Responde de manera natural, humana y empática.
-   - Usa un tono profesional pero cercano, como un asistente conversacional amable.
-   - Puedes mantener una pequeña charla o responder a saludos sin entrar en análisis financieros.
-   - Ejemplo:
-     - Usuario: “Hola”
-     - Respuesta: “¡Hola! Encantado de saludarte 👋 Soy tu CFO Virtual. Puedo ayudarte con proyecciones, análisis de indicadores o simplemente resolver dudas sobre tus finanzas.”
-
-3. **Estilo general:**
-   - Sé breve, claro y cortés.
-   - Evita respuestas repetitivas o demasiado largas.
-   - No cites el contexto ni repitas instrucciones.
-    """
+    kpis_text = prompt_builder.fragment("kpis", kpi_version(), lambda: compact_kpis(kpis_macro or {}))
+    context, prompt_tokens = prompt_builder.build(question, [
+        ("Pronóstico", forecast_hint or "Sin pronósticos recientes disponibles."),
+        ("Contexto macroeconómico", kpis_text),
+    ])
 
     # --------------------------
     # 🧠 Llamar a Gemini
     # --------------------------
-    if MODEL is None:
-        print("🚨 [ERROR] No hay modelo Gemini inicializado. Revisa configuración.")
-        return "Error interno: Gemini no está configurado correctamente."
+    model_name, model = llm.get(wait=5.0)
+    if model is None:
+        print(f"🚨 [ERROR] No hay modelo Gemini disponible: {llm.status()}")
+        return "Error interno: Gemini no está disponible en este momento."
 
     try:
-        print("📤 [Gemini Request] Enviando prompt al modelo...")
-        response = MODEL.generate_content(context + "\n\nPregunta: " + question)
+        print(f"📤 [Gemini Request] Enviando prompt a {model_name}...")
+        gen_start = time.time()
+        response = model.generate_content(context)
+        prompt_builder.record(prompt_tokens, response, time.time() - gen_start)
         print("📥 [Gemini Response] Respuesta recibida correctamente.")
         print("🧾 [Gemini Output] Primeras líneas de respuesta:\n", response.text[:200])
         print(f"[DEBUG] forecast_hint usado: {forecast_hint}")
-        return response.text.strip()
+        answer = response.text.strip()
+        response_cache.put(question, answer, scope)
+        return answer
     except Exception as e:
         print(f"🚨 [Gemini Error] {e}")
+        llm.report_failure(model_name, e)
         return "Lo siento, no pude generar una respuesta en este momento."
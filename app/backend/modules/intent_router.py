@@ -0,0 +1,244 @@
+import re
+import unicodedata
+from collections import deque
+from functools import lru_cache
+
+# ==========================
+# 🧭 Router de intenciones (Aho-Corasick)
+# ==========================
+# Todas las palabras clave (intenciones) y alias de series se compilan una
+# sola vez en un autómata Aho-Corasick. Una pregunta se recorre en una sola
+# pasada y el resultado (intenciones + series mencionadas) se memoiza, así que
+# el prompt, la caché, las alertas y cfo_voice reutilizan la misma
+# clasificación en lugar de repetir `any(word in question_lower ...)`.
+#
+# Sin dependencias fuera de la biblioteca estándar: cfo_voice lo copia tal cual.
+
+# Palabras clave por intención (se normalizan: sin acentos ni mayúsculas).
+# Cada clave es una palabra completa; las que terminan en "*" son raíces y
+# también encuentran sus derivados ("afecta*" → "afectan", "afectaría").
+INTENTS = {
+    "tipo_cambio": ["dólar*", "tipo de cambio", "usd", "cambio", "peso mexicano"],
+    "tasa": ["tasa*", "interés", "intereses", "banxico", "cetes", "tiie"],
+    "inflacion": ["inflación", "precios", "inpc"],
+    "mercados": ["bolsa*", "ipc", "acciones", "s&p", "nasdaq", "oro"],
+    "crecimiento": ["pib", "crecimiento económico", "producto interno", "economía", "recesión"],
+    "empresa": ["empresa*", "negocio*", "estado financiero*", "estados financieros", "cómo va", "compañía*",
+                "utilidad*", "margen*"],
+    "ventas": ["venta*", "ingreso*", "vender", "vendemos", "vendo"],
+    "inversion": ["invertir", "invierto", "inversión", "inversiones", "donde poner"],
+    "credito": ["crédito*", "préstamo*", "pedir prestado"],
+    "gastos": ["gasto*", "reducir", "ahorrar", "ahorro*", "costo*"],
+    "flujo": ["flujo*", "caja", "liquidez", "efectivo"],
+    "pronostico": ["pronóstico*", "proyección", "proyecciones", "predicción", "predicciones", "estimado*",
+                   "estimada*", "va a", "van a", "cuánto estará*", "será*", "próximo*", "próxima*",
+                   "siguiente*", "futuro*", "mañana"],
+    # Pide un solo dato ("¿a cuánto está...?", "¿cuál es la tasa...?")
+    "dato": ["cuánto*", "cuánta*", "cuál es", "cuál será", "cuáles son", "cómo está*", "en qué nivel", "nivel",
+             "valor", "precio", "cotiza*", "cotización"],
+    # Plantea un supuesto ("¿cuánto subirá el dólar si gana...?"): lo resuelve el LLM
+    "condicional": ["si", "en caso de", "suponiendo", "asumiendo", "qué pasa si", "qué pasaría"],
+    # Pide opinión o explicación: necesita al LLM aunque mencione un dato
+    "opinion": ["por qué", "porque", "conviene", "debería*", "recomienda*", "explica*", "explícame", "opinas",
+                "opinión", "qué hago", "estrategia*", "riesgo*", "impacto*", "afecta*", "compara*", "mejor", "peor"],
+}
+
+# Intenciones cuya respuesta depende de los números de la empresa
+BUSINESS_INTENTS = frozenset({"empresa", "ventas"})
+
+# Series de data/externos: (etiqueta, unidad, alias). El nombre de la serie con
+# espacios también es un alias. Los alias son palabras completas ("yen" no está
+# en "yendo"): los plurales van aparte. Si dos alias se traslapan gana el más largo
+# ("tipo de cambio euro" → tipo_cambio_euro, no tipo_cambio_fix).
+SERIES = {
+    "tipo_cambio_fix": ("Tipo de cambio FIX", "MXN/USD", ["tipo de cambio", "dólar", "dolares", "usd", "fix", "peso dólar"]),
+    "tipo_cambio_interbancario": ("Tipo de cambio interbancario", "MXN/USD", ["interbancario", "tipo de cambio interbancario"]),
+    "tipo_cambio_historico": ("Tipo de cambio histórico", "MXN/USD", ["tipo de cambio histórico"]),
+    "tipo_cambio_euro": ("Tipo de cambio del euro", "MXN/EUR", ["euro", "euros", "tipo de cambio euro", "tipo de cambio del euro"]),
+    "usdmxn_frankfurter": ("USD/MXN (Frankfurter)", "MXN/USD", ["usdmxn", "usd mxn"]),
+    "usdmxn_stooq": ("USD/MXN (Stooq)", "MXN/USD", ["usdmxn stooq"]),
+    "eurmxn_frankfurter": ("EUR/MXN", "MXN/EUR", ["eurmxn", "eur mxn"]),
+    "usdeur_frankfurter": ("USD/EUR", "EUR/USD", ["usdeur", "dólar euro", "dólar frente al euro"]),
+    "usdjpy_frankfurter": ("USD/JPY", "JPY/USD", ["yen", "yenes", "usdjpy"]),
+    "tasa_referencia": ("Tasa de referencia", "%", ["tasa de referencia", "tasa objetivo", "tasa banxico",
+                                                    "tasa de banxico"]),
+    "tasa_fondeo": ("Tasa de fondeo", "%", ["fondeo", "tasa de fondeo"]),
+    "tasa_reportos": ("Tasa de reportos", "%", ["reporto", "reportos"]),
+    "cetes_28d": ("CETES a 28 días", "%", ["cetes", "cetes 28"]),
+    "tiie_28d": ("TIIE a 28 días", "%", ["tiie", "tiie 28", "tiie a 28"]),
+    "tiie_91d": ("TIIE a 91 días", "%", ["tiie 91", "tiie a 91"]),
+    "inpc_general": ("INPC general", "puntos", ["inflación", "inpc", "índice de precios", "precios al consumidor"]),
+    "inpc_subyacente": ("INPC subyacente", "puntos", ["subyacente", "inflación subyacente", "inpc subyacente"]),
+    "udis": ("UDIS", "MXN", ["udi", "udis"]),
+    "ipc_bmv": ("IPC de la BMV", "puntos", ["ipc", "bolsa mexicana", "bmv", "bolsa de valores"]),
+    "sp500_stooq": ("S&P 500", "puntos", ["s&p", "sp500", "s p 500", "standard and poor"]),
+    "nasdaq_stooq": ("Nasdaq", "puntos", ["nasdaq"]),
+    "gold_xauusd_stooq": ("Oro", "USD/oz", ["oro", "xauusd"]),
+    "pib_trimestral_desestacionalizado": ("PIB trimestral desestacionalizado", "MDP", ["pib", "producto interno",
+                                                                                       "pib desestacionalizado"]),
+    "pib_trimestral_inegi_limpio": ("PIB trimestral (INEGI)", "MDP", ["pib trimestral", "pib inegi"]),
+    "gdp_mx_wdi": ("PIB anual (Banco Mundial)", "USD", ["gdp", "pib anual"]),
+    "debt_gdp_mx_wdi": ("Deuda pública / PIB", "%", ["deuda", "deuda pública", "deuda pib"]),
+    "population_mx_wdi": ("Población", "personas", ["población", "habitantes"]),
+    "unemployment_mx_wdi": ("Desempleo", "%", ["desempleo", "tasa de desempleo"]),
+    "remesas_familiares": ("Remesas familiares", "MDD", ["remesas", "remesas familiares"]),
+    "remittances_mx_wdi": ("Remesas anuales (Banco Mundial)", "USD", ["remesas anuales", "remittances"]),
+    "reservas_internacionales": ("Reservas internacionales", "MDD", ["reservas", "reservas internacionales"]),
+    "captacion_bancaria_total": ("Captación bancaria", "MDP", ["captación", "captación bancaria", "depósitos"]),
+    "credito_privado_total": ("Crédito al sector privado", "MDP", ["crédito privado", "crédito al sector privado"]),
+    "confianza_consumidor_banxico": ("Confianza del consumidor", "puntos", ["confianza del consumidor",
+                                                                            "confianza consumidor"]),
+    "confianza_empresarial_banxico": ("Confianza empresarial", "puntos", ["confianza empresarial"]),
+}
+
+# Alias genéricos: solo cuentan si la pregunta no nombra otra serie de su grupo
+# ("¿cuál es la tasa de CETES?" es cetes_28d, no también la tasa de referencia)
+RATE_SERIES = frozenset({"tasa_referencia", "tasa_fondeo", "tasa_reportos", "cetes_28d", "tiie_28d", "tiie_91d"})
+GENERIC_ALIASES = {
+    "tasa_referencia": (["tasa de interés", "tasas de interés", "tasa", "tasas", "interés", "intereses", "banxico"],
+                        RATE_SERIES),
+}
+
+
+def normalize(text: str) -> str:
+    """Minúsculas, sin acentos; todo lo que no es letra o número se vuelve un espacio."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return re.sub(r"[^a-z0-9]+", " ", text).strip()
+
+
+# --------------------------
+# 🏗️ Autómata
+# --------------------------
+class _Automaton:
+    """Aho-Corasick sobre texto normalizado; cada patrón lleva su carga (tipo, valor)."""
+
+    def __init__(self, patterns):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+
+        for pattern, payload in patterns:
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append((len(pattern), payload))
+
+        # Enlaces de fallo por anchura; cada nodo hereda las salidas de su sufijo
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def scan(self, text: str):
+        """Genera (inicio, fin, carga) de todos los patrones presentes en `text`."""
+        node = 0
+        for end, ch in enumerate(text, 1):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for length, payload in self._out[node]:
+                yield end - length, end, payload
+
+
+def _patterns():
+    # El espacio inicial exige inicio de palabra (el texto se rellena igual);
+    # el fin de palabra se revisa en `route` salvo para las raíces ("...*")
+    for intent, words in INTENTS.items():
+        for word in words:
+            yield " " + normalize(word.rstrip("*")), ("intent", intent, word.endswith("*"))
+    for serie, (_, _, aliases) in SERIES.items():
+        for alias in {*aliases, serie.replace("_", " ")}:
+            yield " " + normalize(alias), ("serie", serie, False)
+    for serie, (aliases, _) in GENERIC_ALIASES.items():
+        for alias in aliases:
+            yield " " + normalize(alias), ("generic", serie, False)
+
+
+_automaton = _Automaton(_patterns())
+
+
+# --------------------------
+# 🧭 Clasificación
+# --------------------------
+class Route:
+    """Resultado de clasificar una pregunta (inmutable: se comparte entre etapas)."""
+
+    __slots__ = ("text", "intents", "series")
+
+    def __init__(self, text: str, intents: frozenset, series: tuple):
+        self.text = text
+        self.intents = intents
+        self.series = series
+
+    @property
+    def serie(self):
+        """Primera serie mencionada, o None."""
+        return self.series[0] if self.series else None
+
+    @property
+    def is_business(self) -> bool:
+        return bool(self.intents & BUSINESS_INTENTS)
+
+    def __repr__(self):
+        return f"Route(intents={sorted(self.intents)}, series={list(self.series)})"
+
+
+@lru_cache(maxsize=2048)
+def route(question: str) -> Route:
+    """Intenciones y series (en orden de aparición) de `question`, en una sola pasada."""
+    text = normalize(question)
+    padded = f" {text} "
+    intents, matches = set(), []
+    for start, end, (kind, value, stem) in _automaton.scan(padded):
+        if not stem and padded[end] != " ":
+            continue
+        if kind == "intent":
+            intents.add(value)
+        else:
+            matches.append((start, end, value, kind == "generic"))
+
+    # Alias traslapados: gana el más largo que empieza primero
+    found, taken_until = [], -1
+    for start, end, serie, generic in sorted(matches, key=lambda m: (m[0], m[0] - m[1])):
+        if start >= taken_until:
+            taken_until = end
+            found.append((serie, generic))
+
+    specific = {serie for serie, generic in found if not generic}
+    series = []
+    for serie, generic in found:
+        if generic and specific & GENERIC_ALIASES[serie][1] - {serie}:
+            continue
+        if serie not in series:
+            series.append(serie)
+    return Route(text, frozenset(intents), tuple(series))
+
+
+def label(serie: str) -> str:
+    return SERIES[serie][0] if serie in SERIES else serie
+
+
+def unit(serie: str) -> str:
+    return SERIES[serie][1] if serie in SERIES else ""
+
+
+def format_value(serie: str, value: float) -> str:
+    """Valor con la unidad de la serie ("5.43%", "18.52 MXN/USD")."""
+    serie_unit = unit(serie)
+    if serie_unit == "%":
+        return f"{value:,.2f}%"
+    return f"{value:,.2f} {serie_unit}".strip()
@@ -0,0 +1,136 @@
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+# ==========================
+# 🗄️ Caché de modelos ajustados
+# ==========================
+# Memoria (LRU) + disco: un worker reiniciado recarga el modelo
+# serializado en lugar de volver a correr el ajuste de Stan.
+
+
+class ModelCache:
+    """Caché LRU en memoria de modelos ajustados, respaldada en disco."""
+
+    def __init__(self, max_items: int = 32, cache_dir=None, dump=None, load=None, keep_versions: int = 2):
+        self.max_items = max_items
+        self.keep_versions = keep_versions
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._dump = dump
+        self._load = load
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    # --------------------------
+    # 🔑 Claves y rutas
+    # --------------------------
+    def _path(self, key):
+        if self.cache_dir is None or self._load is None:
+            return None
+        serie, data_hash, config_hash = key
+        return self.cache_dir / f"{serie}__{data_hash[:16]}__{config_hash[:16]}.json"
+
+    # --------------------------
+    # 📥 Lectura / escritura
+    # --------------------------
+    def get(self, key):
+        """Devuelve el modelo para `key` (memoria → disco) o None."""
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return self._items[key]
+
+        path = self._path(key)
+        if path is None or not path.exists():
+            return None
+
+        try:
+            model = self._load(path.read_text(encoding="utf-8"))
+        except Exception as e:
+            print(f"[ModelCache] ⚠️ No se pudo leer {path.name}: {e}")
+            return None
+
+        self._remember(key, model)
+        return model
+
+    def stored(self, key) -> bool:
+        """True si `key` ya está en memoria o en disco (sin cargarlo)."""
+        with self._lock:
+            if key in self._items:
+                return True
+        path = self._path(key)
+        return path is not None and path.exists()
+
+    def put(self, key, model):
+        """Guarda el modelo en memoria y, si hay serializador, en disco."""
+        self._remember(key, model)
+
+        path = self._path(key)
+        if path is None or self._dump is None:
+            return
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(self._dump(model), encoding="utf-8")
+            os.replace(tmp, path)
+            self._prune(key)
+        except Exception as e:
+            print(f"[ModelCache] ⚠️ No se pudo guardar {path.name}: {e}")
+
+    def _prune(self, key):
+        """Conserva en disco solo las `keep_versions` versiones más recientes de la serie."""
+        serie, _, config_hash = key
+        versions = sorted(
+            self.cache_dir.glob(f"{serie}__*__{config_hash[:16]}.json"),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        )
+        for old in versions[self.keep_versions:]:
+            old.unlink(missing_ok=True)
+
+    def get_or_fit(self, key, fit_fn):
+        """Devuelve el modelo cacheado o lo ajusta con `fit_fn()` y lo guarda."""
+        model = self.get(key)
+        if model is None:
+            model = fit_fn()
+            self.put(key, model)
+        return model
+
+    def latest(self, serie, config_hash):
+        """Modelo más reciente de `serie` con la misma configuración, sin importar los datos.
+
+        Sirve para arrancar en caliente un reajuste cuando la serie recibió datos nuevos.
+        """
+        with self._lock:
+            for key in reversed(self._items):
+                if key[0] == serie and key[2] == config_hash:
+                    return self._items[key]
+
+        if self.cache_dir is None or self._load is None or not self.cache_dir.exists():
+            return None
+
+        candidates = sorted(
+            self.cache_dir.glob(f"{serie}__*__{config_hash[:16]}.json"),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        )
+        for path in candidates:
+            try:
+                return self._load(path.read_text(encoding="utf-8"))
+            except Exception as e:
+                print(f"[ModelCache] ⚠️ No se pudo leer {path.name}: {e}")
+        return None
+
+    def _remember(self, key, model):
+        with self._lock:
+            self._items[key] = model
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        """Vacía la caché en memoria (los archivos en disco se conservan)."""
+        with self._lock:
+            self._items.clear()
@@ -0,0 +1,131 @@
+import time
+import threading
+
+# ==========================
+# 🩺 Selección del modelo LLM en segundo plano
+# ==========================
+# Al arrancar ya no se prueba cada modelo con una llamada en vivo: un hilo
+# prueba los candidatos en orden de preferencia, guarda el primero que responde
+# y lo vuelve a verificar cada `ttl` segundos. Si una petición reporta un
+# fallo, se adelanta la verificación y se cambia al siguiente candidato.
+# Mientras no haya modelo, la app sigue sirviendo (modo degradado).
+
+PROBE_PROMPT = "Di solo 'ok'"
+
+
+class ModelSelector:
+    """Modelo LLM activo, elegido y re-verificado por un hilo de salud."""
+
+    def __init__(self, candidates, factory, ttl: float = 600.0, retry_interval: float = 60.0,
+                 probe_timeout: float = 10.0, min_recheck: float = 15.0, enabled: bool = True):
+        self.candidates = list(candidates)
+        self.ttl = ttl
+        self.retry_interval = retry_interval
+        self.probe_timeout = probe_timeout
+        self.min_recheck = min_recheck
+        self.enabled = enabled and bool(self.candidates)
+
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._current = (None, None)
+        self._checked_at = 0.0
+        self._last_error = None
+        self._ready = threading.Event()
+        self._wake = threading.Event()
+        self._started = False
+
+    # --------------------------
+    # 📥 Acceso
+    # --------------------------
+    def start(self):
+        """Lanza el hilo de salud (no bloquea)."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        if not self.enabled:
+            self._ready.set()
+            return
+        threading.Thread(target=self._run, name="llm-health", daemon=True).start()
+
+    def get(self, wait: float = 0.0):
+        """(nombre, modelo) activos o (None, None); espera hasta `wait` s a la primera verificación."""
+        if not self._ready.is_set():
+            self._ready.wait(wait)
+        with self._lock:
+            return self._current
+
+    @property
+    def name(self):
+        return self._current[0]
+
+    def report_failure(self, name: str, error: Exception = None):
+        """Una petición falló con `name`: adelanta la re-verificación (con un mínimo entre rondas)."""
+        print(f"[LLM] ⚠️ Fallo reportado en {name}: {str(error)[:100] if error else ''}")
+        with self._lock:
+            self._last_error = str(error)[:200] if error else self._last_error
+            recent = time.time() - self._checked_at < self.min_recheck
+        if not recent:
+            self._wake.set()
+
+    def status(self) -> dict:
+        with self._lock:
+            name = self._current[0]
+            checked_at, error = self._checked_at, self._last_error
+        if not self.enabled:
+            state = "disabled"
+        elif not self._ready.is_set():
+            state = "starting"
+        else:
+            state = "ok" if name else "degraded"
+        return {
+            "state": state,
+            "model": name,
+            "checked_s_ago": round(time.time() - checked_at, 1) if checked_at else None,
+            "last_error": error,
+        }
+
+    # --------------------------
+    # 🔍 Verificación
+    # --------------------------
+    def _probe(self, candidate: str):
+        model = self._factory(candidate)
+        resp = model.generate_content(
+            PROBE_PROMPT,
+            generation_config={"temperature": 0, "max_output_tokens": 10},
+            request_options={"timeout": self.probe_timeout},
+        )
+        if not resp or not resp.text:
+            raise RuntimeError("respuesta vacía")
+        return model
+
+    def _select(self):
+        """Primer candidato que responde, en orden de preferencia."""
+        previous = self._current[0]
+        for candidate in self.candidates:
+            try:
+                model = self._probe(candidate)
+            except Exception as e:
+                print(f"[LLM] ⚠️ Modelo {candidate} falló: {str(e)[:100]}")
+                with self._lock:
+                    self._last_error = f"{candidate}: {str(e)[:200]}"
+                continue
+
+            with self._lock:
+                self._current = (candidate, model)
+                self._checked_at = time.time()
+            if candidate != previous:
+                print(f"[LLM] ✅ Modelo activo: {candidate}")
+            return
+
+        with self._lock:
+            self._current = (None, None)
+            self._checked_at = time.time()
+        print(f"[LLM] ❌ Ningún modelo respondió; reintento en {self.retry_interval:g}s (modo degradado)")
+
+    def _run(self):
+        while True:
+            self._select()
+            self._ready.set()
+            self._wake.wait(self.ttl if self.name else self.retry_interval)
+            self._wake.clear()
@@ -0,0 +1,142 @@
+import re
+import textwrap
+import threading
+
+# ==========================
+# 🧾 Prompts precompilados con presupuesto de tokens
+# ==========================
+# Las instrucciones fijas se compactan una sola vez al crear el builder. El
+# contexto (KPIs, análisis de la empresa...) se renderiza en fragmentos
+# compactos que se reutilizan mientras no cambie la versión de sus datos.
+# Cada petición arma el prompt respetando un presupuesto de tokens: las
+# secciones van en orden de prioridad y las últimas se recortan o se omiten.
+# Tras cada llamada se registran los tokens de entrada reales (usage_metadata
+# de Gemini) o, si no vienen, la estimación.
+
+# Aproximación de tokens para español sin tokenizador local (~4 caracteres por token)
+CHARS_PER_TOKEN = 4
+
+# Por debajo de esto no vale la pena incluir un trozo de sección
+MIN_SECTION_TOKENS = 20
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def compact(text: str) -> str:
+    """Quita la sangría común, espacios al final de línea y líneas en blanco repetidas."""
+    text = textwrap.dedent(text).strip()
+    text = re.sub(r"[ \t]+\n", "\n", text)
+    return re.sub(r"\n{3,}", "\n\n", text)
+
+
+def compact_kpis(kpis: dict) -> str:
+    """KPIs en una línea (`clave=valor; ...`) en lugar de JSON con sangría."""
+    parts = []
+    for key, value in kpis.items():
+        if isinstance(value, float):
+            value = f"{value:.4g}"
+        parts.append(f"{key}={value}")
+    return "; ".join(parts)
+
+
+class PromptBuilder:
+    """Arma prompts de un endpoint: instrucciones fijas + fragmentos versionados + pregunta."""
+
+    def __init__(self, name: str, instructions: str, budget: int = 1500):
+        self.name = name
+        self.instructions = compact(instructions)
+        self.budget = budget
+        self._instructions_tokens = estimate_tokens(self.instructions)
+        self._fragments = {}      # nombre → (versión, texto)
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "input_tokens": 0, "max_input_tokens": 0, "measured": 0,
+                       "trimmed": 0, "dropped": 0, "latency_s": 0.0}
+
+    # --------------------------
+    # 🧩 Fragmentos de contexto
+    # --------------------------
+    def fragment(self, name: str, version, render) -> str:
+        """Texto de `name` para `version`; solo llama a `render()` si la versión cambió."""
+        with self._lock:
+            cached = self._fragments.get(name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        text = compact(render() or "")
+        with self._lock:
+            self._fragments[name] = (version, text)
+        return text
+
+    # --------------------------
+    # 📐 Armado con presupuesto
+    # --------------------------
+    def build(self, question: str, sections: list) -> tuple:
+        """(prompt, tokens_estimados) con `sections` = [(título, texto)] en orden de prioridad."""
+        question_block = f"Pregunta: {question.strip()}"
+        remaining = self.budget - self._instructions_tokens - estimate_tokens(question_block)
+
+        blocks, trimmed, dropped = [self.instructions], 0, 0
+        for title, text in sections:
+            if not text:
+                continue
+            block = f"{title}: {text}" if title else text
+            tokens = estimate_tokens(block)
+            if tokens > remaining:
+                if remaining < MIN_SECTION_TOKENS:
+                    dropped += 1
+                    continue
+                # Se corta en un límite de línea/frase para no dejar cifras a medias
+                cut = block[:remaining * CHARS_PER_TOKEN]
+                boundary = max(cut.rfind("\n"), cut.rfind("; "), cut.rfind(". "))
+                if boundary > 0:
+                    cut = cut[:boundary]
+                block, tokens = cut, estimate_tokens(cut)
+                trimmed += 1
+            blocks.append(block)
+            remaining -= tokens
+
+        blocks.append(question_block)
+        prompt = "\n\n".join(blocks)
+        estimated = estimate_tokens(prompt)
+        if trimmed or dropped:
+            print(f"[Prompt] ✂️ {self.name}: {trimmed} sección(es) recortadas, {dropped} omitidas (presupuesto {self.budget})")
+        if estimated > self.budget:
+            print(f"[Prompt] ⚠️ {self.name}: ~{estimated} tokens exceden el presupuesto de {self.budget}")
+        with self._lock:
+            self._stats["trimmed"] += trimmed
+            self._stats["dropped"] += dropped
+        return prompt, estimated
+
+    # --------------------------
+    # 📊 Medición
+    # --------------------------
+    def record(self, estimated: int, response=None, latency_s: float = 0.0) -> int:
+        """Registra los tokens de entrada de una llamada (reales si Gemini los reporta)."""
+        usage = getattr(response, "usage_metadata", None) if response is not None else None
+        measured = getattr(usage, "prompt_token_count", None) if usage is not None else None
+        tokens = measured or estimated
+
+        with self._lock:
+            self._stats["calls"] += 1
+            self._stats["input_tokens"] += tokens
+            self._stats["max_input_tokens"] = max(self._stats["max_input_tokens"], tokens)
+            self._stats["measured"] += bool(measured)
+            self._stats["latency_s"] += latency_s
+        print(f"[Prompt] 📏 {self.name}: {tokens} tokens de entrada "
+              f"({'medidos' if measured else 'estimados'}), {latency_s:.2f}s")
+        return tokens
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        calls = stats.pop("calls")
+        latency = stats.pop("latency_s")
+        return dict(
+            stats,
+            calls=calls,
+            budget=self.budget,
+            instructions_tokens=self._instructions_tokens,
+            avg_input_tokens=round(stats["input_tokens"] / calls, 1) if calls else 0.0,
+            avg_latency_s=round(latency / calls, 3) if calls else 0.0,
+        )
@@ -1,8 +1,27 @@
+import io
 import os
+import copy
 import json
+import hashlib
+import numbers
+import datetime as dt
+import numpy as np
 import pandas as pd
-from prophet import Prophet
+from statistics import NormalDist
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+from modules.model_cache import ModelCache
+from modules.singleflight import SingleFlight
+from modules.swr_cache import SWRCache, VersionedFile
+from modules.forecast_worker import ForecastWorkerPool, ForecastJobError
+from modules import ets_engine, var_engine
+
+# Prophet (y cmdstanpy) se importan en el primer ajuste: importar este módulo
+# no debe costar más que pandas, para que los workers arranquen al instante
+if TYPE_CHECKING:
+    from prophet import Prophet
 
 # ==========================
 # ⚙️ Configuración de rutas
@@ -10,46 +29,561 @@ from pathlib import Path
 DATA_PATH = Path(__file__).resolve().parent.parent / "data" / "processed"
 MACRO_FILE = DATA_PATH / "macro_dataset_clean.csv"
 KPI_FILE = DATA_PATH / "kpis_macro.json"
+FORECAST_FILE = DATA_PATH / "forecasts.csv"
+CACHE_DIR = Path(os.getenv("FORECAST_CACHE_DIR", DATA_PATH.parent / "cache" / "models"))
+REGISTRY_FILE = DATA_PATH.parent / "series_registry.json"
+
+# Backends de pronóstico: "prophet" (Stan), "ets" (NumPy, suavizamiento
+# exponencial) o "var" (NumPy, un solo VAR para todo el panel)
+BACKENDS = ("prophet", "ets", "var")
+
+# Configuración de una serie cuando el registro no la define:
+#   freq    → alias de pandas de la frecuencia nativa (None = se infiere de las fechas)
+#   backend → uno de BACKENDS
+#   prophet → argumentos de Prophet(); forman parte de la clave de caché del modelo
+DEFAULT_SERIES_CONFIG = {
+    "freq": None,
+    "backend": os.getenv("FORECAST_BACKEND", "prophet"),
+    "prophet": {},
+}
+
+# Reajuste incremental: sembrar el optimizador con los parámetros del ajuste anterior
+WARM_START = os.getenv("FORECAST_WARM_START", "1") == "1"
+
+# Estimación de incertidumbre: "none" (solo yhat), "analytic" (aproximación
+# cerrada, sin muestreo) o "sampled" (simulación de Prophet con `samples` muestras)
+UNCERTAINTY_MODES = ("none", "analytic", "sampled")
+DEFAULT_UNCERTAINTY = os.getenv("FORECAST_UNCERTAINTY", "sampled")
+DEFAULT_SAMPLES = 1000
+MAX_SAMPLES = 5000
+
+# Horizontes en pasos de la frecuencia nativa de cada serie (mensual → meses)
+DEFAULT_HORIZON = 3
+MAX_HORIZON = 120
+
+# Horizonte con el que se precalcula la tabla de pronósticos
+BATCH_HORIZON = 24
+FORECAST_COLUMNS = ["serie", "ds", "yhat", "yhat_lower", "yhat_upper", "model_version"]
 
 # ==========================
 # 📈 Carga de datos
 # ==========================
-if MACRO_FILE.exists():
-    macro_df = pd.read_csv(MACRO_FILE, parse_dates=["fecha"])
-else:
-    print("⚠️  No se encontró macro_dataset_clean.csv")
-    macro_df = pd.DataFrame()
+# Los archivos se leen en el primer acceso, se versionan por contenido y se
+# recargan en segundo plano cuando el pipeline los reescribe; mientras tanto
+# se usa la versión anterior.
+_refresh_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="data-refresh")
+
+def _read_macro(raw: bytes) -> pd.DataFrame:
+    return pd.read_csv(io.BytesIO(raw), parse_dates=["fecha"])
+
+def _read_kpis(raw: bytes) -> dict:
+    return json.loads(raw.decode("utf-8"))
+
+def _read_forecast_table(raw: bytes) -> dict:
+    """Lee la tabla precalculada y la indexa por serie."""
+    table = pd.read_csv(io.BytesIO(raw), parse_dates=["ds"])
+    return {serie: group.drop(columns="serie").reset_index(drop=True)
+            for serie, group in table.groupby("serie", sort=False)}
+
+macro_data = VersionedFile(MACRO_FILE, _read_macro, pd.DataFrame(), _refresh_pool)
+kpi_data = VersionedFile(KPI_FILE, _read_kpis, {}, _refresh_pool)
+registry_data = VersionedFile(REGISTRY_FILE, _read_kpis, {}, _refresh_pool, required=False)
+forecast_table_data = VersionedFile(FORECAST_FILE, _read_forecast_table, {}, _refresh_pool, required=False)
+
+def get_macro_df() -> pd.DataFrame:
+    """Panel macroeconómico vigente (macro_dataset_clean.csv)."""
+    return macro_data.value
+
+def get_forecast_table() -> dict:
+    """Tabla de pronósticos precalculados, indexada por serie."""
+    return forecast_table_data.value
 
-if KPI_FILE.exists():
-    kpis_macro = json.load(open(KPI_FILE, "r", encoding="utf-8"))
-else:
-    print("⚠️  No se encontró kpis_macro.json")
-    kpis_macro = {}
+def series_config(serie: str) -> dict:
+    """Configuración de `serie`: DEFAULT_SERIES_CONFIG ← "defaults" del registro ← la serie.
+
+    El backend global sale de FORECAST_BACKEND (DEFAULT_SERIES_CONFIG); el registro
+    solo debería fijar "backend" por serie, nunca en "defaults".
+    """
+    registry = registry_data.value
+    defaults = registry.get("defaults", {})
+    own = registry.get("series", {}).get(serie, {})
+
+    config = {**DEFAULT_SERIES_CONFIG, **defaults, **own}
+    config["prophet"] = {**DEFAULT_SERIES_CONFIG["prophet"], **defaults.get("prophet", {}), **own.get("prophet", {})}
+    return config
+
+def data_version() -> str:
+    """Versión conjunta de los datos de los que dependen los pronósticos."""
+    return f"{macro_data.version[:12]}-{forecast_table_data.version[:12]}"
 
 # ==========================
-# 🔮 Funciones principales
+# 🗄️ Caché de modelos
 # ==========================
-def get_kpis():
-    """Devuelve el JSON con KPIs macroeconómicos."""
-    return kpis_macro
+def _model_to_json(model: "Prophet") -> str:
+    from prophet.serialize import model_to_json
+    return model_to_json(model)
+
+def _model_from_json(raw: str) -> "Prophet":
+    from prophet.serialize import model_from_json
+    return model_from_json(raw)
+
+model_cache = ModelCache(
+    max_items=int(os.getenv("FORECAST_CACHE_SIZE", "32")),
+    cache_dir=CACHE_DIR,
+    dump=_model_to_json,
+    load=_model_from_json,
+)
+
+# Hilos para pronósticos de varias series a la vez (Stan corre en un subproceso)
+FORECAST_THREADS = int(os.getenv("FORECAST_THREADS", min(4, os.cpu_count() or 1)))
+_pool = ThreadPoolExecutor(max_workers=FORECAST_THREADS, thread_name_prefix="forecast")
+
+# Ajustes de Prophet en procesos aparte, con límite de tiempo y memoria por
+# trabajo (FORECAST_WORKERS=0 → en este mismo proceso). Cada proceso ocupa
+# ~120 MB tras un ajuste y puede llegar a FORECAST_JOB_MEMORY_MB: por defecto
+# uno de 256 MB, que junto al proceso web cabe en el contenedor de 512 MB
+# (Dockerrun.aws.json). Con más memoria, subir FORECAST_WORKERS evita que un
+# lote de predict_many se ajuste por turnos. Los scripts de dataAnalysis ya
+# reparten entre procesos y ajustan localmente.
+forecast_workers = ForecastWorkerPool(
+    processes=int(os.getenv("FORECAST_WORKERS", "1")),
+    timeout=float(os.getenv("FORECAST_JOB_TIMEOUT", "60")),
+    memory_mb=int(os.getenv("FORECAST_JOB_MEMORY_MB", "256")) or None,
+)
+
+# Peticiones simultáneas con la misma clave comparten un único ajuste/predicción
+_flight = SingleFlight()
+
+# Pronósticos ya calculados: se sirven al instante y se recalculan en segundo
+# plano cuando cambia data_version()
+point_cache = SWRCache(_refresh_pool, max_items=int(os.getenv("FORECAST_POINT_CACHE_SIZE", "256")))
+frame_cache = SWRCache(_refresh_pool, max_items=int(os.getenv("FORECAST_FRAME_CACHE_SIZE", "128")))
+
+# Series ya extraídas del panel, por versión de datos
+_frames = {}
+
+# VAR del panel completo: (versión de datos, modelo)
+_var_state = {}
+
+def _data_hash(df: pd.DataFrame) -> str:
+    """Huella del contenido de la serie (cambia si el pipeline reescribe datos)."""
+    values = pd.util.hash_pandas_object(df, index=False).values
+    return hashlib.sha1(values.tobytes()).hexdigest()
+
+def _config_hash(config: dict) -> str:
+    return hashlib.sha1(json.dumps(config, sort_keys=True).encode("utf-8")).hexdigest()
+
+def _warm_start_params(model: "Prophet") -> dict:
+    """Parámetros de un modelo ajustado en el formato `init` de Stan."""
+    res = {}
+    for pname in ["k", "m", "sigma_obs"]:
+        res[pname] = model.params[pname][0][0]
+    for pname in ["delta", "beta"]:
+        res[pname] = model.params[pname][0]
+    return res
+
+def _fit_model(df: pd.DataFrame, config: dict, init_model: "Prophet" = None) -> "Prophet":
+    """Ajusta Prophet; si hay un ajuste previo, arranca la optimización desde sus parámetros."""
+    from prophet import Prophet
+
+    if init_model is not None:
+        try:
+            model = Prophet(**config)
+            model.fit(df, init=_warm_start_params(init_model))
+            return model
+        except Exception as e:
+            print(f"[Prophet] ⚠️ Arranque en caliente falló, ajuste completo: {e}")
+
+    model = Prophet(**config)
+    model.fit(df)
+    return model
+
+def _series_frame(serie: str):
+    """Devuelve (df ds/y, None) o (None, dict de error) para `serie`."""
+    macro_df = get_macro_df()
+    version = macro_data.version
+    cached = _frames.get(serie)
+    if cached is not None and cached[0] == version:
+        return cached[1], None
 
-def predict_serie(serie: str, periods: int = 90):
-    """Predice una serie temporal usando Prophet."""
     if macro_df.empty:
-        return {"error": "No hay datos macroeconómicos cargados."}
+        return None, {"error": "No hay datos macroeconómicos cargados."}
 
     if serie not in macro_df.columns:
-        return {"error": f"La serie '{serie}' no existe en macro_dataset_clean.csv."}
+        return None, {"error": f"La serie '{serie}' no existe en macro_dataset_clean.csv."}
 
     df = macro_df[["fecha", serie]].dropna().rename(columns={"fecha": "ds", serie: "y"})
     if len(df) < 10:
-        return {"error": f"No hay suficientes datos para predecir '{serie}'."}
+        return None, {"error": f"No hay suficientes datos para predecir '{serie}'."}
 
-    model = Prophet()
-    model.fit(df)
+    _frames[serie] = (version, df)
+    return df, None
+
+def infer_freq(df: pd.DataFrame) -> str:
+    """Frecuencia nativa de la serie como alias de pandas (p. ej. "ME" para fin de mes)."""
+    freq = pd.infer_freq(df["ds"].tail(24))
+    if freq:
+        return freq
+
+    # Fechas irregulares: aproximar por el espaciado típico
+    step = df["ds"].diff().dt.days.median()
+    if step <= 1:
+        return "D"
+    if step <= 7:
+        return "W"
+    if step <= 31:
+        return "ME" if df["ds"].dt.is_month_end.all() else "MS"
+    if step <= 92:
+        return "QE"
+    return "YE"
+
+def _future_dates(df: pd.DataFrame, horizon: int, freq: str) -> pd.DatetimeIndex:
+    return pd.date_range(df["ds"].iloc[-1], periods=horizon + 1, freq=freq)[1:]
+
+def native_freq(serie: str, df: pd.DataFrame) -> str:
+    """Frecuencia de `serie` según el registro o, si no la define, inferida de las fechas."""
+    return series_config(serie)["freq"] or infer_freq(df)
+
+def model_version(serie: str, df: pd.DataFrame, freq: str = None) -> str:
+    """Versión del pronóstico: configuración, contenido de los datos y frecuencia de salida."""
+    freq = freq or native_freq(serie, df)
+    prophet_config = series_config(serie)["prophet"]
+    return f"prophet-{_config_hash(prophet_config)[:8]}-{_data_hash(df)[:8]}-{freq}"
+
+# ==========================
+# 🔮 Funciones principales
+# ==========================
+def get_kpis():
+    """Devuelve el JSON con KPIs macroeconómicos (última versión cargada)."""
+    return kpi_data.value
+
+def kpi_version() -> str:
+    """Versión (hash del contenido) de kpis_macro.json; cambia cuando el pipeline lo reescribe."""
+    return kpi_data.version
+
+def latest_value(serie: str) -> dict:
+    """Último dato observado de la serie: {"ds", "y"} o {"error": ...}."""
+    df, error = _series_frame(serie)
+    if error:
+        return error
+    last = df.iloc[-1]
+    return {"ds": last["ds"], "y": float(last["y"])}
+
+def _model_key(serie: str, df: pd.DataFrame) -> tuple:
+    """Clave del modelo en `model_cache`: (serie, hash de datos, hash de configuración)."""
+    return serie, _data_hash(df), _config_hash(series_config(serie)["prophet"])
+
+def _get_model(serie: str, df: pd.DataFrame) -> "Prophet":
+    """Modelo ajustado de `serie` desde la caché o, si falta, un ajuste nuevo."""
+    config = series_config(serie)["prophet"]
+    key = _model_key(serie, df)
+    config_hash = key[2]
+
+    def fit():
+        previous = model_cache.latest(serie, config_hash) if WARM_START else None
+        return _fit_model(df, config, previous)
+
+    return _flight.do(("model",) + key, lambda: model_cache.get_or_fit(key, fit))
+
+def _analytic_width(model: "Prophet", ds: pd.Series) -> np.ndarray:
+    """Semiancho del intervalo sin simular trayectorias.
 
-    future = model.make_future_dataframe(periods=periods)
+    Combina el ruido de observación ajustado (sigma_obs) con la varianza de la
+    tendencia cuando aparecen cambios futuros de pendiente a la misma tasa y
+    escala (Laplace) que en el histórico, igual que supone el muestreo de Prophet.
+    """
+    sigma_obs = float(model.params["sigma_obs"].ravel()[0])
+    deltas = np.asarray(model.params["delta"])
+    rate = len(model.changepoints_t)
+    scale = float(np.mean(np.abs(deltas))) + 1e-8
+
+    t = ((ds - model.start) / model.t_scale).to_numpy(dtype=float)
+    ahead = np.clip(t - 1.0, 0.0, None)
+    trend_var = 2 * scale ** 2 * rate * ahead ** 3 / 3
+
+    z = NormalDist().inv_cdf(0.5 + model.interval_width / 2)
+    return z * model.y_scale * np.sqrt(sigma_obs ** 2 + trend_var)
+
+def _prophet_predict(model: "Prophet", future: pd.DataFrame, uncertainty: str, samples: int) -> pd.DataFrame:
+    """Predice con el modo de incertidumbre pedido sin modificar el modelo cacheado."""
+    model = copy.copy(model)
+    model.uncertainty_samples = samples if uncertainty == "sampled" else 0
     forecast = model.predict(future)
+    if uncertainty == "sampled":
+        return forecast[["ds", "yhat", "yhat_lower", "yhat_upper"]]
+
+    out = forecast[["ds", "yhat"]].copy()
+    width = _analytic_width(model, out["ds"]) if uncertainty == "analytic" else 0.0
+    out["yhat_lower"] = out["yhat"] - width
+    out["yhat_upper"] = out["yhat"] + width
+    return out
+
+def _without_interval(rows: pd.DataFrame) -> pd.DataFrame:
+    rows = rows.copy()
+    rows["yhat_lower"] = rows["yhat"]
+    rows["yhat_upper"] = rows["yhat"]
+    return rows
+
+def _predict_local(serie: str, df: pd.DataFrame, future: pd.DatetimeIndex, uncertainty: str, samples: int):
+    """Modelo (caché o ajuste) y predicción de las fechas `future`, en este proceso.
+
+    Solo se predicen las fechas futuras pedidas: no se vuelve a predecir el histórico.
+    """
+    return _prophet_predict(_get_model(serie, df), pd.DataFrame({"ds": future}), uncertainty, samples)
+
+def _run_prophet(serie: str, df: pd.DataFrame, future: pd.DatetimeIndex, uncertainty: str, samples: int):
+    """Como `_predict_local`, pero en un worker aparte si el pool está activo.
+
+    Cada worker tiene su propia caché en memoria, así que el ajuste se coalesce
+    aquí por modelo: si aún no está en disco, la primera petición ajusta y
+    predice; las demás (otra fecha, horizonte o incertidumbre) esperan a que
+    termine y luego solo predicen, cargando el modelo del disco.
+    """
+    if not forecast_workers.enabled:
+        return _predict_local(serie, df, future, uncertainty, samples)
+
+    def run():
+        job = forecast_workers.submit(__name__, "_predict_local", serie, df, future, uncertainty, samples)
+        return forecast_workers.result(job)
+
+    key = _model_key(serie, df)
+    if model_cache.stored(key):
+        return run()
+
+    leader = []
+    def fit_and_predict():
+        leader.append(True)
+        return run()
+
+    result = _flight.do(("model",) + key, fit_and_predict)
+    return result if leader else run()
+
+def compute_forecast(serie: str, horizon: int = DEFAULT_HORIZON, freq: str = None,
+                     uncertainty: str = DEFAULT_UNCERTAINTY, samples: int = DEFAULT_SAMPLES):
+    """Ajusta (o recupera de caché) el modelo de `serie` y predice `horizon` pasos de `freq`.
+
+    Corre en el proceso que llama (los scripts de precálculo ya usan su propio pool).
+    """
+    df, error = _series_frame(serie)
+    if error:
+        return error
+    future = _future_dates(df, horizon, freq or native_freq(serie, df))
+    return _predict_local(serie, df, future, uncertainty, samples).to_dict(orient="records")
+
+def _from_table(serie: str, df: pd.DataFrame, horizon: int, freq: str = None,
+                uncertainty: str = DEFAULT_UNCERTAINTY):
+    """Pronóstico precalculado, solo si corresponde a la versión vigente del modelo."""
+    rows = get_forecast_table().get(serie)
+    if rows is None or len(rows) < horizon:
+        return None
+
+    if rows["model_version"].iat[0] != model_version(serie, df, freq):
+        return None
+
+    rows = rows.head(horizon)[["ds", "yhat", "yhat_lower", "yhat_upper"]]
+    return _without_interval(rows) if uncertainty == "none" else rows
+
+def macro_panel() -> pd.DataFrame:
+    """Panel alineado fechas × series (todas las columnas numéricas del dataset)."""
+    macro_df = get_macro_df()
+    if macro_df.empty:
+        return macro_df
+    panel = macro_df.set_index("fecha").select_dtypes("number")
+    return panel.ffill().dropna()
+
+def _var_model() -> dict:
+    """VAR de todas las series para la versión vigente de los datos: un ajuste para el panel."""
+    version = macro_data.version
+    cached = _var_state.get("model")
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    def fit():
+        model = var_engine.fit(macro_panel(), MAX_HORIZON)
+        _var_state["model"] = (version, model)
+        return model
+
+    return _flight.do(("var", version), fit)
+
+def _var_predict(serie: str, future: pd.DatetimeIndex, uncertainty: str) -> pd.DataFrame:
+    # Igual que ETS: intervalos analíticos también cuando se pide "sampled"
+    forecast = var_engine.predict(_var_model(), serie, future)
+    return _without_interval(forecast) if uncertainty == "none" else forecast
+
+def _ets_predict(df: pd.DataFrame, future: pd.DatetimeIndex, uncertainty: str) -> pd.DataFrame:
+    # Los intervalos de ETS siempre son analíticos; "sampled" usa los mismos
+    forecast = ets_engine.predict(df, future)
+    return _without_interval(forecast) if uncertainty == "none" else forecast
+
+def resolve_backend(serie: str, backend: str = None) -> str:
+    """Backend a usar: el pedido explícitamente o el del registro de series."""
+    return _check_backend(backend or series_config(serie)["backend"])
+
+def _check_backend(backend: str) -> str:
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend '{backend}' no soportado. Opciones: {', '.join(BACKENDS)}")
+    return backend
+
+def _check_horizon(horizon, freq):
+    horizon = DEFAULT_HORIZON if horizon is None else int(horizon)
+    if not 1 <= horizon <= MAX_HORIZON:
+        raise ValueError(f"El horizonte debe estar entre 1 y {MAX_HORIZON}.")
+    if freq is not None:
+        pd.tseries.frequencies.to_offset(freq)  # ValueError si el alias no es válido
+    return horizon
+
+def _check_target(date_or_horizon, freq):
+    """Número de pasos (entero, también de numpy) o fecha; ValueError si es ambiguo.
+
+    Un bool, un flotante o un texto numérico ("3") podrían ser cualquiera de los dos.
+    """
+    if date_or_horizon is None:
+        return _check_horizon(None, freq)
+    if isinstance(date_or_horizon, bool):
+        raise ValueError("El horizonte debe ser un número entero de pasos o una fecha, no un booleano.")
+    if isinstance(date_or_horizon, numbers.Integral):
+        return _check_horizon(int(date_or_horizon), freq)
+    target = pd.NaT
+    if isinstance(date_or_horizon, (dt.date, np.datetime64)):
+        target = pd.Timestamp(date_or_horizon)
+    elif isinstance(date_or_horizon, str) and not date_or_horizon.strip().lstrip("+-").replace(".", "").isdigit():
+        try:
+            target = pd.Timestamp(date_or_horizon)
+        except ValueError:
+            pass
+    if target is not pd.NaT:
+        return target
+    raise ValueError(f"'{date_or_horizon}' no es un número de pasos ni una fecha válida.")
+
+def _check_uncertainty(uncertainty, samples):
+    uncertainty = uncertainty or DEFAULT_UNCERTAINTY
+    if uncertainty not in UNCERTAINTY_MODES:
+        raise ValueError(f"Incertidumbre '{uncertainty}' no soportada. Opciones: {', '.join(UNCERTAINTY_MODES)}")
+    samples = DEFAULT_SAMPLES if samples is None else int(samples)
+    if not 1 <= samples <= MAX_SAMPLES:
+        raise ValueError(f"Las muestras deben estar entre 1 y {MAX_SAMPLES}.")
+    return uncertainty, samples
+
+def _compute_frame(serie, horizon, freq, backend, uncertainty, samples):
+    df, error = _series_frame(serie)
+    if error:
+        return error
+
+    if backend in ("ets", "var"):
+        future = _future_dates(df, horizon, freq or native_freq(serie, df))
+        if backend == "var":
+            return _var_predict(serie, future, uncertainty)
+        return _ets_predict(df, future, uncertainty)
+
+    # La tabla ya trae intervalos muestreados con DEFAULT_SAMPLES: sirve para todo
+    # salvo cuando se pide explícitamente otro número de muestras
+    if uncertainty != "sampled" or samples == DEFAULT_SAMPLES:
+        rows = _from_table(serie, df, horizon, freq, uncertainty)
+        if rows is not None:
+            return rows
+    return _run_prophet(serie, df, _future_dates(df, horizon, freq or native_freq(serie, df)), uncertainty, samples)
+
+def forecast_frame(serie: str, horizon: int = None, freq: str = None, backend: str = None,
+                   uncertainty: str = None, samples: int = None):
+    """Pronóstico como DataFrame (ds, yhat, yhat_lower, yhat_upper) o dict de error.
+
+    Si los datos cambiaron desde el último cálculo se devuelve el resultado anterior
+    y el nuevo se calcula en segundo plano.
+    """
+    horizon = _check_horizon(horizon, freq)
+    uncertainty, samples = _check_uncertainty(uncertainty, samples)
+    backend = resolve_backend(serie, backend)
+
+    key = ("frame", serie, horizon, freq, backend, uncertainty, samples, _config_hash(series_config(serie)))
+
+    def compute():
+        return _flight.do(key, lambda: _compute_frame(serie, horizon, freq, backend, uncertainty, samples))
+
+    return frame_cache.get(key, data_version(), compute)
+
+def predict_serie(serie: str, horizon: int = None, freq: str = None, backend: str = None,
+                  uncertainty: str = None, samples: int = None):
+    """Predice `horizon` pasos de una serie (por defecto en su frecuencia nativa).
+
+    Frecuencia, backend y componentes del modelo salen del registro de series
+    (data/series_registry.json); los argumentos explícitos tienen prioridad.
+    Con Prophet usa la tabla precalculada y, si no aplica, el modelo cacheado.
+    `uncertainty` elige cómo se calculan yhat_lower/yhat_upper (ver UNCERTAINTY_MODES).
+    """
+    frame = forecast_frame(serie, horizon, freq, backend, uncertainty, samples)
+    return frame if isinstance(frame, dict) else frame.to_dict(orient="records")
+
+def predict_many(series: list, **kwargs) -> dict:
+    """Pronostica varias series en paralelo; respuesta columnar {serie: {columna: [...]}}.
+
+    Comparte la caché de modelos con `predict_serie` (mismo proceso, hilos del pool).
+    Con backend="var" todas las series salen de un único ajuste del panel.
+    Las opciones son de toda la petición: si no son válidas se lanza un solo
+    ValueError en lugar de repetir el error en cada serie.
+    """
+    _check_horizon(kwargs.get("horizon"), kwargs.get("freq"))
+    _check_uncertainty(kwargs.get("uncertainty"), kwargs.get("samples"))
+    if kwargs.get("backend") is not None:
+        _check_backend(kwargs["backend"])
+
+    futures = {serie: _pool.submit(forecast_frame, serie, **kwargs) for serie in dict.fromkeys(series)}
+
+    result = {}
+    for serie, future in futures.items():
+        try:
+            frame = future.result()
+        except (ValueError, ForecastJobError) as e:
+            frame = {"error": str(e)}
+        result[serie] = frame if isinstance(frame, dict) else frame.to_dict(orient="list")
+    return result
+
+def _point_from_table(serie: str, df: pd.DataFrame, target: pd.Timestamp):
+    rows = get_forecast_table().get(serie)
+    if rows is None or rows["model_version"].iat[0] != model_version(serie, df):
+        return None
+    match = rows[rows["ds"] == target]
+    return None if match.empty else match.iloc[0]
+
+def _compute_point(serie: str, df: pd.DataFrame, target: pd.Timestamp, backend: str,
+                   uncertainty: str, samples: int):
+    future = pd.DatetimeIndex([target])
+    row = None
+    if backend == "ets":
+        row = _ets_predict(df, future, uncertainty).iloc[0]
+    elif backend == "var":
+        row = _var_predict(serie, future, uncertainty).iloc[0]
+    elif uncertainty != "sampled" or samples == DEFAULT_SAMPLES:
+        row = _point_from_table(serie, df, target)
+        if row is not None and uncertainty == "none":
+            row = _without_interval(row.to_frame().T).iloc[0]
+    if row is None:
+        row = _run_prophet(serie, df, future, uncertainty, samples).iloc[0]
+
+    return {"ds": target, "yhat": float(row["yhat"]),
+            "yhat_lower": float(row["yhat_lower"]), "yhat_upper": float(row["yhat_upper"])}
+
+def predict_point(serie: str, date_or_horizon=DEFAULT_HORIZON, freq: str = None, backend: str = None,
+                  uncertainty: str = None, samples: int = None):
+    """Pronóstico de un solo punto: {"ds", "yhat", "yhat_lower", "yhat_upper"}.
+
+    `date_or_horizon` es una fecha o un número de pasos en la frecuencia de la serie.
+    Predice solo esa fecha; el resultado se guarda en `point_cache` y, si los datos
+    cambian, se recalcula en segundo plano mientras se sirve el anterior.
+    """
+    backend = resolve_backend(serie, backend)
+    uncertainty, samples = _check_uncertainty(uncertainty, samples)
+    date_or_horizon = _check_target(date_or_horizon, freq)
+
+    key = ("point", serie, date_or_horizon, freq, backend, uncertainty, samples, _config_hash(series_config(serie)))
+
+    def compute_point():
+        df, error = _series_frame(serie)
+        if error:
+            return error
+        if isinstance(date_or_horizon, int):
+            target = _future_dates(df, date_or_horizon, freq or native_freq(serie, df))[-1]
+        else:
+            target = date_or_horizon
+        return _compute_point(serie, df, target, backend, uncertainty, samples)
 
-    latest = forecast.tail(periods)[["ds", "yhat", "yhat_lower", "yhat_upper"]]
-    return latest.to_dict(orient="records")
+    return point_cache.get(key, data_version(), lambda: _flight.do(key, compute_point))
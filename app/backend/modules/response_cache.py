@@ -0,0 +1,402 @@
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from pathlib import Path
+from collections import OrderedDict, defaultdict
+
+import numpy as np
+
+# ==========================
+# 💬 Caché de respuestas por similitud
+# ==========================
+# Las preguntas se normalizan (acentos, puntuación, palabras vacías) y se
+# comparan por MinHash sobre trigramas de caracteres: "¿Cómo está el dólar?"
+# y "como esta el dolar hoy" caen en la misma entrada sin llamar al LLM.
+# LSH (bandas de la firma) evita comparar contra toda la caché. Las cifras,
+# negaciones y acciones opuestas no se comparan por similitud: van en el
+# alcance, así "en 3 meses" nunca responde a "en 6 meses".
+# Expulsión LRU + TTL, con estadísticas de aciertos.
+#
+# Dos niveles: el LRU en memoria de cada proceso y, detrás, un almacén
+# compartido (SQLite en modo WAL) para que los workers de gunicorn compartan
+# respuestas y estas sobrevivan a un reinicio o despliegue.
+
+DEFAULT_DB = Path(__file__).resolve().parent.parent / "data" / "cache" / "responses.db"
+
+STOPWORDS = {
+    "a", "al", "ante", "con", "de", "del", "el", "en", "es", "esta", "este", "la", "las",
+    "le", "lo", "los", "me", "mi", "mis", "nos", "o", "para", "por", "que", "se", "su",
+    "sus", "te", "tu", "un", "una", "uno", "y", "ya", "como", "cual", "hoy", "ahora",
+    "actualmente", "ahorita", "favor", "dime", "puedes", "podrias", "quiero", "saber", "oye",
+    "hola", "va", "anda", "estan", "hay", "cuanto", "precio", "valor", "nivel",
+}
+
+# Palabras que cambian el sentido de la respuesta aunque el resto sea igual:
+# negaciones, números escritos y acciones opuestas. Junto con las cifras forman
+# una clave dura (en orden de aparición) que debe coincidir exactamente
+HARD_WORDS = {
+    "no", "nunca", "sin", "jamas", "ni",
+    "uno", "dos", "tres", "cuatro", "cinco", "seis", "siete", "ocho", "nueve", "diez", "once", "doce",
+    "comprar", "compro", "compra", "vender", "vendo", "vende",
+    "subir", "sube", "subira", "bajar", "baja", "bajara", "aumentar", "aumenta", "disminuir", "disminuye",
+}
+
+# Primo de Mersenne 2^31 - 1: a*h + b cabe en uint64 sin desbordar
+_PRIME = (1 << 31) - 1
+
+
+def normalize(text: str) -> str:
+    """Minúsculas, sin acentos ni puntuación y sin palabras vacías."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    words = re.sub(r"[^a-z0-9]+", " ", text).split()
+    return " ".join(w for w in words if w not in STOPWORDS)
+
+
+def hard_key(normalized: str) -> str:
+    """Cifras y palabras de `HARD_WORDS` en orden: "6 meses" ≠ "3 meses", "no conviene" ≠ "conviene"."""
+    return " ".join(w for w in normalized.split() if w.isdigit() or w in HARD_WORDS)
+
+
+def shingles(normalized: str) -> set:
+    """Trigramas de caracteres por palabra (toleran errores de transcripción y el orden)."""
+    grams = set()
+    for word in normalized.split():
+        padded = f"#{word}#"
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+# ==========================
+# 🗄️ Almacén compartido (SQLite WAL)
+# ==========================
+class SQLiteStore:
+    """Segundo nivel de la caché: un archivo SQLite compartido entre procesos.
+
+    Una conexión por hilo; WAL permite lecturas concurrentes con un escritor y
+    `busy_timeout` serializa las escrituras de varios workers. Es una caché:
+    cualquier error de SQLite se registra y se trata como fallo de caché.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS answers (
+        id INTEGER PRIMARY KEY,
+        scope TEXT NOT NULL,
+        question TEXT NOT NULL,
+        answer TEXT NOT NULL,
+        signature BLOB NOT NULL,
+        created REAL NOT NULL,
+        UNIQUE (scope, question)
+    );
+    CREATE TABLE IF NOT EXISTS bands (band BLOB NOT NULL, answer_id INTEGER NOT NULL);
+    CREATE INDEX IF NOT EXISTS bands_band ON bands (band);
+    CREATE INDEX IF NOT EXISTS bands_answer ON bands (answer_id);
+    CREATE INDEX IF NOT EXISTS answers_created ON answers (created);
+    """
+
+    def __init__(self, path, max_items: int = 5000, prune_every: int = 50):
+        self.path = Path(path)
+        self.max_items = max_items
+        self.prune_every = prune_every
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._writes = 0
+        self._conn()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self.SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def exact(self, scope: str, question: str, min_created: float):
+        """(respuesta, firma, creada) de la misma pregunta normalizada, o None."""
+        try:
+            return self._conn().execute(
+                "SELECT answer, signature, created FROM answers WHERE scope = ? AND question = ? AND created >= ?",
+                (scope, question, min_created),
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"[Cache] ⚠️ SQLite: {e}")
+            return None
+
+    def candidates(self, bands: list, min_created: float) -> list:
+        """[(pregunta, respuesta, firma, creada)] que comparten alguna banda LSH."""
+        marks = ",".join("?" * len(bands))
+        try:
+            return self._conn().execute(
+                f"SELECT DISTINCT a.question, a.answer, a.signature, a.created FROM bands b "
+                f"JOIN answers a ON a.id = b.answer_id WHERE b.band IN ({marks}) AND a.created >= ?",
+                (*bands, min_created),
+            ).fetchall()
+        except sqlite3.Error as e:
+            print(f"[Cache] ⚠️ SQLite: {e}")
+            return []
+
+    def save(self, scope: str, question: str, answer: str, signature: bytes, created: float,
+             bands: list, min_created: float):
+        try:
+            conn = self._conn()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                self._delete(conn, "scope = ? AND question = ?", (scope, question))
+                cur = conn.execute(
+                    "INSERT INTO answers (scope, question, answer, signature, created) VALUES (?, ?, ?, ?, ?)",
+                    (scope, question, answer, signature, created),
+                )
+                conn.executemany("INSERT INTO bands (band, answer_id) VALUES (?, ?)",
+                                 [(band, cur.lastrowid) for band in bands])
+                self._writes += 1
+                if self._writes % self.prune_every == 0:
+                    self._prune(conn, min_created)
+        except sqlite3.Error as e:
+            print(f"[Cache] ⚠️ SQLite: {e}")
+
+    def _prune(self, conn: sqlite3.Connection, min_created: float):
+        """Borra lo vencido y, si sobra, lo más antiguo por encima de `max_items`."""
+        self._delete(conn, "created < ?", (min_created,))
+        self._delete(conn, "id NOT IN (SELECT id FROM answers ORDER BY created DESC LIMIT ?)", (self.max_items,))
+
+    @staticmethod
+    def _delete(conn: sqlite3.Connection, where: str, params: tuple):
+        conn.execute(f"DELETE FROM bands WHERE answer_id IN (SELECT id FROM answers WHERE {where})", params)
+        conn.execute(f"DELETE FROM answers WHERE {where}", params)
+
+    def count(self) -> int:
+        try:
+            return self._conn().execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+        except sqlite3.Error:
+            return -1
+
+    def clear(self):
+        try:
+            conn = self._conn()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute("DELETE FROM bands")
+                conn.execute("DELETE FROM answers")
+        except sqlite3.Error as e:
+            print(f"[Cache] ⚠️ SQLite: {e}")
+
+
+# ==========================
+# 💬 Caché de dos niveles
+# ==========================
+class ResponseCache:
+    """Caché LRU+TTL de respuestas que también acierta con preguntas casi iguales.
+
+    `store` (opcional) es el nivel compartido: se consulta cuando falla la
+    memoria y recibe cada respuesta nueva.
+    """
+
+    def __init__(self, max_items: int = 500, ttl: float = 3600.0, threshold: float = 0.7,
+                 num_perm: int = 64, bands: int = 16, seed: int = 7, store: SQLiteStore = None):
+        self.max_items = max_items
+        self.ttl = ttl
+        self.threshold = threshold
+        self.bands = bands
+        self.store = store
+        self._rows = num_perm // bands
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _PRIME, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, num_perm, dtype=np.uint64)
+
+        self._items = OrderedDict()          # (scope, normalizada) → (respuesta, firma, creada)
+        self._buckets = defaultdict(set)     # (scope, banda, valores) → claves
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "near_hits": 0, "store_hits": 0, "misses": 0, "evictions": 0, "expired": 0}
+
+    # --------------------------
+    # 🔏 Firma MinHash
+    # --------------------------
+    def _signature(self, normalized: str) -> np.ndarray:
+        grams = shingles(normalized)
+        hashes = np.array(
+            [int.from_bytes(hashlib.blake2b(g.encode(), digest_size=4).digest(), "little") for g in grams],
+            dtype=np.uint64,
+        )
+        return ((self._a[:, None] * hashes[None, :] + self._b[:, None]) % _PRIME).min(axis=1)
+
+    def _band_keys(self, scope: str, signature: np.ndarray):
+        for band in range(self.bands):
+            rows = signature[band * self._rows:(band + 1) * self._rows]
+            yield (scope, band, rows.tobytes())
+
+    def _store_bands(self, scope: str, signature: np.ndarray) -> list:
+        """Bandas LSH como claves compactas para el almacén compartido."""
+        return [hashlib.blake2b(repr(key).encode(), digest_size=8).digest()
+                for key in self._band_keys(scope, signature)]
+
+    # --------------------------
+    # 📥 Lectura / escritura
+    # --------------------------
+    def get(self, question: str, scope: str = ""):
+        """Respuesta cacheada para `question` (o una casi igual) dentro de `scope`, o None."""
+        normalized = normalize(question)
+        scope = f"{scope}#{hard_key(normalized)}"
+        key = (scope, normalized)
+        now = time.time()
+
+        if not normalized:
+            # Solo palabras vacías ("hola", "¿y?"): no hay nada que comparar
+            with self._lock:
+                self._stats["misses"] += 1
+            return None
+
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None and self._alive(key, entry, now):
+                self._items.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry[0]
+
+        signature = self._signature(normalized)
+        with self._lock:
+            candidates = set()
+            for band_key in self._band_keys(scope, signature):
+                candidates.update(self._buckets.get(band_key, ()))
+
+            best, best_sim = None, self.threshold
+            for candidate in candidates:
+                entry = self._items.get(candidate)
+                if entry is None or not self._alive(candidate, entry, now):
+                    continue
+                sim = float(np.mean(entry[1] == signature))
+                if sim >= best_sim:
+                    best, best_sim = candidate, sim
+
+            if best is not None:
+                self._items.move_to_end(best)
+                self._stats["near_hits"] += 1
+                return self._items[best][0]
+
+        answer = self._from_store(scope, normalized, signature, now)
+        with self._lock:
+            self._stats["store_hits" if answer is not None else "misses"] += 1
+        return answer
+
+    def _from_store(self, scope: str, normalized: str, signature: np.ndarray, now: float):
+        """Busca en el almacén compartido (igual o casi igual) y sube el acierto a memoria."""
+        if self.store is None:
+            return None
+        min_created = now - self.ttl
+
+        row = self.store.exact(scope, normalized, min_created)
+        if row is not None:
+            found = (normalized, *row)
+        else:
+            found, best_sim = None, self.threshold
+            for question, answer, blob, created in self.store.candidates(self._store_bands(scope, signature), min_created):
+                stored = np.frombuffer(blob, dtype=np.uint64)
+                if len(stored) != len(signature):
+                    continue
+                sim = float(np.mean(stored == signature))
+                if sim >= best_sim:
+                    found, best_sim = (question, answer, blob, created), sim
+        if found is None:
+            return None
+
+        question, answer, blob, created = found
+        self._remember((scope, question), answer, np.frombuffer(blob, dtype=np.uint64), created)
+        return answer
+
+    def put(self, question: str, answer: str, scope: str = ""):
+        normalized = normalize(question)
+        if not normalized:
+            return
+        scope = f"{scope}#{hard_key(normalized)}"
+        signature = self._signature(normalized)
+        created = time.time()
+        self._remember((scope, normalized), answer, signature, created)
+        if self.store is not None:
+            self.store.save(scope, normalized, answer, signature.tobytes(), created,
+                            self._store_bands(scope, signature), created - self.ttl)
+
+    def _remember(self, key, answer: str, signature: np.ndarray, created: float):
+        """Guarda en el nivel en memoria (LRU)."""
+        with self._lock:
+            if key in self._items:
+                self._drop(key)
+            self._items[key] = (answer, signature, created)
+            for band_key in self._band_keys(key[0], signature):
+                self._buckets[band_key].add(key)
+            while len(self._items) > self.max_items:
+                self._drop(next(iter(self._items)))
+                self._stats["evictions"] += 1
+
+    def _alive(self, key, entry, now) -> bool:
+        if now - entry[2] <= self.ttl:
+            return True
+        self._drop(key)
+        self._stats["expired"] += 1
+        return False
+
+    def _drop(self, key):
+        _, signature, _ = self._items.pop(key)
+        for band_key in self._band_keys(key[0], signature):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    # --------------------------
+    # 📊 Estadísticas
+    # --------------------------
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats, size=len(self._items))
+        hits = stats["hits"] + stats["near_hits"] + stats["store_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_rate"] = round(hits / lookups, 3) if lookups else 0.0
+        if self.store is not None:
+            stats["store_size"] = self.store.count()
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._buckets.clear()
+        if self.store is not None:
+            self.store.clear()
+
+
+# ==========================
+# 🔗 Instancia compartida del proceso
+# ==========================
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Caché de respuestas del proceso (main, main_with_advisor y gemini_engine usan la misma).
+
+    RESPONSE_CACHE_SIZE / RESPONSE_CACHE_TTL: tamaño y vigencia del nivel en memoria.
+    RESPONSE_CACHE_DB: ruta del SQLite compartido ("" = solo memoria).
+    """
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            db_path = os.getenv("RESPONSE_CACHE_DB", str(DEFAULT_DB))
+            store = None
+            if db_path:
+                try:
+                    store = SQLiteStore(db_path, max_items=int(os.getenv("RESPONSE_CACHE_DB_SIZE", "5000")))
+                    print(f"[Cache] 🗄️ Caché compartida en {db_path}")
+                except (sqlite3.Error, OSError) as e:
+                    print(f"[Cache] ⚠️ Sin caché compartida ({e}); solo memoria")
+            _shared = ResponseCache(
+                max_items=int(os.getenv("RESPONSE_CACHE_SIZE", "500")),
+                ttl=float(os.getenv("RESPONSE_CACHE_TTL", "3600")),
+                store=store,
+            )
+        return _shared
@@ -0,0 +1,52 @@
+import threading
+
+# ==========================
+# 🛫 Single-flight
+# ==========================
+# Llamadas concurrentes con la misma clave esperan a una sola ejecución
+# en curso y comparten su resultado (o su excepción).
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesce llamadas concurrentes idénticas en una sola ejecución."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        """Ejecuta `fn()` una vez por `key` en vuelo; los demás llamadores esperan el resultado."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """Número de claves que se están calculando en este momento."""
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,170 @@
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+# ==========================
+# ♻️ Stale-while-revalidate
+# ==========================
+# Los archivos de datos llevan una versión (mtime+tamaño → hash del contenido).
+# Cuando la versión cambia se recargan / recalculan en segundo plano y,
+# mientras tanto, se sigue sirviendo el último valor bueno. La primera lectura
+# ocurre en el primer acceso, no al importar.
+
+
+class VersionedFile:
+    """Archivo de datos versionado que se carga al primer acceso y se recarga en segundo plano al cambiar."""
+
+    def __init__(self, path, loader, default, executor, check_interval: float = 2.0, required: bool = True):
+        self.path = Path(path)
+        self._loader = loader
+        self._default = default
+        self._executor = executor
+        self.check_interval = check_interval
+        self.required = required
+
+        self._lock = threading.Lock()
+        self._value = default
+        self._version = "missing"
+        self._stat = None
+        self._checked_at = 0.0
+        self._reloading = False
+        self._loaded = False
+        self._load_lock = threading.Lock()
+
+    # --------------------------
+    # 📥 Acceso
+    # --------------------------
+    def _ensure_loaded(self):
+        """Primera carga síncrona; los hilos que llegan a la vez esperan a la misma."""
+        if self._loaded:
+            return
+        with self._load_lock:
+            if self._loaded:
+                return
+            self._reload()
+            self._checked_at = time.monotonic()
+            self._loaded = True
+
+    @property
+    def value(self):
+        """Último valor bueno; si el archivo cambió, agenda la recarga sin bloquear."""
+        self._ensure_loaded()
+        self.check()
+        return self._value
+
+    @property
+    def version(self) -> str:
+        self._ensure_loaded()
+        self.check()
+        return self._version
+
+    # --------------------------
+    # 🔍 Detección de cambios
+    # --------------------------
+    def _current_stat(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def check(self):
+        """Revisa (como mucho cada `check_interval` s) si el archivo cambió en disco."""
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+
+        if self._current_stat() == self._stat:
+            return
+
+        with self._lock:
+            if self._reloading:
+                return
+            self._reloading = True
+        self._executor.submit(self._reload)
+
+    def _reload(self):
+        try:
+            stat = self._current_stat()
+            if stat is None:
+                if self.required:
+                    print(f"⚠️  No se encontró {self.path.name}")
+                value, version = self._default, "missing"
+            else:
+                raw = self.path.read_bytes()
+                version = hashlib.sha1(raw).hexdigest()
+                value = self._loader(raw) if version != self._version else self._value
+
+            with self._lock:
+                self._value, self._version, self._stat = value, version, stat
+            if stat is not None:
+                print(f"[Data] 🔄 {self.path.name} cargado (versión {version[:8]})")
+        except Exception as e:
+            # Se conserva el último valor bueno
+            print(f"⚠️  No se pudo leer {self.path.name}: {e}")
+        finally:
+            with self._lock:
+                self._reloading = False
+
+
+class SWRCache:
+    """Caché LRU que sirve el último valor al instante y lo recalcula en segundo plano.
+
+    Cada entrada guarda la versión de datos con la que se calculó; si la versión
+    vigente es otra, se devuelve el valor viejo y se agenda un recálculo.
+    """
+
+    def __init__(self, executor, max_items: int = 256):
+        self.max_items = max_items
+        self._executor = executor
+        self._items = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def get(self, key, version, compute):
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None:
+                self._items.move_to_end(key)
+
+        if entry is None:
+            value = compute()
+            self._store(key, version, value)
+            return value
+
+        stored_version, value = entry
+        if stored_version != version:
+            self._schedule(key, version, compute)
+        return value
+
+    def _schedule(self, key, version, compute):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._store(key, version, compute())
+            except Exception as e:
+                print(f"[SWR] ⚠️ No se pudo refrescar {key}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._executor.submit(refresh)
+
+    def _store(self, key, version, value):
+        with self._lock:
+            self._items[key] = (version, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+
+# ==========================
+# 🧮 VAR del panel macro completo (NumPy puro)
+# ==========================
+# Un solo ajuste para todas las series: VAR(p) con regularización ridge sobre
+# las variaciones estandarizadas (log-diferencias si la serie es siempre
+# positiva). Los coeficientes de todo el panel salen de una sola solución
+# lineal y el pronóstico avanza todas las series a la vez. Los intervalos son
+# analíticos (matrices de impulso-respuesta acumuladas).
+
+# Rezagos del VAR
+LAGS = 2
+
+# Penalización ridge (sobre datos estandarizados): con ~36 series × LAGS
+# regresores por ecuación, sin ella el VAR sobreajusta
+RIDGE = 100.0
+
+# Solo las últimas observaciones pesan en la estimación
+WINDOW = 240
+
+# z para un intervalo del 80% (mismo ancho por defecto que Prophet)
+Z_80 = 1.2815515655446004
+
+
+def fit(panel: pd.DataFrame, max_steps: int = 120) -> dict:
+    """Ajusta el VAR sobre `panel` (fechas × series, alineado) y precalcula `max_steps` pasos."""
+    panel = panel.tail(WINDOW + 1)
+    levels = panel.to_numpy(dtype=float)
+    logs = (levels > 0).all(axis=0)
+    work = np.where(logs, np.log(np.where(logs, levels, 1.0)), levels)
+
+    diffs = np.diff(work, axis=0)
+    mean = diffs.mean(axis=0)
+    scale = diffs.std(axis=0)
+    scale[scale == 0] = 1.0
+    z = (diffs - mean) / scale
+
+    # Regresores: [z_{t-1}, ..., z_{t-p}] para todas las series a la vez
+    n_obs, n_series = z.shape
+    X = np.hstack([z[LAGS - lag:n_obs - lag] for lag in range(1, LAGS + 1)])
+    Y = z[LAGS:]
+    coefs = np.linalg.solve(X.T @ X + RIDGE * np.eye(X.shape[1]), X.T @ Y)
+
+    resid = Y - X @ coefs
+    sigma = resid.T @ resid / max(len(Y) - X.shape[1], 1)
+
+    model = {
+        "series": list(panel.columns),
+        "last_date": panel.index[-1],
+        "step_days": float(pd.Series(panel.index).diff().dt.days.median()),
+        "logs": logs,
+        "last": work[-1],
+        "mean": mean,
+        "scale": scale,
+        "coefs": coefs,
+        "sigma": sigma,
+        "history": z[-LAGS:],
+    }
+    model["path"] = _simulate(model, max_steps)
+    return model
+
+
+def _simulate(model: dict, steps: int) -> tuple:
+    """Trayectoria puntual y varianzas de `steps` pasos para todas las series."""
+    coefs, scale, mean = model["coefs"], model["scale"], model["mean"]
+    n_series = len(model["series"])
+
+    # Pronóstico recursivo de las variaciones estandarizadas
+    history = list(model["history"])
+    z_path = np.empty((steps, n_series))
+    for step in range(steps):
+        regressors = np.concatenate([history[-lag] for lag in range(1, LAGS + 1)])
+        z_path[step] = regressors @ coefs
+        history.append(z_path[step])
+    level_path = model["last"] + np.cumsum(z_path * scale + mean, axis=0)
+
+    # Respuestas al impulso Ψ_j (forma compañera) acumuladas: el error del
+    # nivel a h pasos es la suma de los errores de las variaciones 1..h
+    companion = np.zeros((n_series * LAGS, n_series * LAGS))
+    companion[:n_series] = coefs.T
+    companion[n_series:, :-n_series] = np.eye(n_series * (LAGS - 1))
+    power = np.eye(n_series * LAGS)
+    cumulative = np.zeros((n_series, n_series))
+    variance = np.zeros(n_series)
+    variances = np.empty((steps, n_series))
+    for step in range(steps):
+        cumulative = cumulative + power[:n_series, :n_series]
+        variance = variance + np.einsum("ij,jk,ik->i", cumulative, model["sigma"], cumulative)
+        variances[step] = variance * scale ** 2
+        power = companion @ power
+
+    return level_path, variances
+
+
+def forecast(model: dict, serie: str, h: np.ndarray) -> tuple:
+    """Pronóstico e intervalo del 80% de `serie` a `h` pasos (h puede ser fraccional)."""
+    col = model["series"].index(serie)
+    level_path, variances = model["path"]
+    h = np.asarray(h, dtype=float)
+
+    # Paso 0 = último dato observado; entre pasos enteros se interpola
+    steps = np.arange(len(level_path) + 1)
+    center = np.interp(h, steps, np.concatenate([[model["last"][col]], level_path[:, col]]))
+    width = Z_80 * np.sqrt(np.interp(h, steps, np.concatenate([[0.0], variances[:, col]])))
+
+    if model["logs"][col]:
+        return np.exp(center), np.exp(center - width), np.exp(center + width)
+    return center, center - width, center + width
+
+
+def predict(model: dict, serie: str, future: pd.DatetimeIndex) -> pd.DataFrame:
+    """Mismo contrato que el pronóstico de Prophet para las fechas `future`."""
+    h = (future - model["last_date"]).days.to_numpy() / model["step_days"]
+    yhat, lower, upper = forecast(model, serie, h)
+    return pd.DataFrame({"ds": future, "yhat": yhat, "yhat_lower": lower, "yhat_upper": upper})
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Las pruebas importan `modules.*` igual que main.py (desde app/backend)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,84 @@
+import pytest
+
+from modules import alert_dispatcher
+from modules.alert_dispatcher import AlertDeliveryError, AlertDispatcher, FakeTransport
+
+
+class CountingTransport:
+    """Falla las primeras `failures` llamadas y registra cada intento."""
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.calls = []
+
+    def send(self, body: str) -> str:
+        self.calls.append(body)
+        if len(self.calls) <= self.failures:
+            raise AlertDeliveryError("Fallo transitorio")
+        return f"SID{len(self.calls)}"
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Reemplaza las esperas del backoff (sin variación aleatoria) y las registra."""
+    delays = []
+    monkeypatch.setattr(alert_dispatcher.time, "sleep", delays.append)
+    monkeypatch.setattr(alert_dispatcher.random, "uniform", lambda a, b: 1.0)
+    return delays
+
+
+def _deliver(transport, **kwargs):
+    dispatcher = AlertDispatcher(transport, workers=1, **kwargs)
+    assert dispatcher.enqueue("USD/MXN superó 20.00")
+    dispatcher.join()
+    return dispatcher
+
+
+def test_transient_failure_is_retried_with_exponential_backoff(sleeps):
+    transport = CountingTransport(failures=2)
+    dispatcher = _deliver(transport, max_retries=3, backoff=0.5)
+
+    assert len(transport.calls) == 3
+    assert sleeps == [0.5, 1.0]
+    assert dispatcher.stats == {"queued": 1, "sent": 1, "retried": 2, "failed": 0, "dropped": 0}
+
+
+def test_gives_up_after_max_retries(sleeps):
+    transport = CountingTransport(failures=100)
+    dispatcher = _deliver(transport, max_retries=2, backoff=0.5)
+
+    assert len(transport.calls) == 3
+    assert sleeps == [0.5, 1.0]
+    assert dispatcher.stats["failed"] == 1
+    assert dispatcher.stats["sent"] == 0
+
+
+@pytest.mark.parametrize("failures", [0, 1])
+def test_no_duplicate_send_after_success(sleeps, failures):
+    transport = CountingTransport(failures=failures)
+    dispatcher = _deliver(transport, max_retries=3)
+
+    assert len(transport.calls) == failures + 1
+    assert dispatcher.stats["sent"] == 1
+
+
+def test_fake_transport_keeps_each_message_once(sleeps):
+    transport = FakeTransport(failures=1)
+    dispatcher = AlertDispatcher(transport, workers=2, max_retries=2)
+    for n in range(5):
+        dispatcher.enqueue(f"alerta {n}")
+    dispatcher.join()
+
+    assert sorted(transport.sent) == [f"alerta {n}" for n in range(5)]
+    assert dispatcher.stats["sent"] == 5
+
+
+def test_full_queue_drops_without_blocking(sleeps):
+    dispatcher = AlertDispatcher(CountingTransport(), workers=0, max_queue=1)
+    assert dispatcher.enqueue("primera")
+    assert not dispatcher.enqueue("segunda")
+    assert dispatcher.stats["dropped"] == 1
+
+
+def test_disabled_without_transport():
+    assert not AlertDispatcher(None).enqueue("sin transporte")
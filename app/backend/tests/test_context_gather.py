@@ -0,0 +1,40 @@
+import time
+
+from modules import context_gather
+
+
+def _sleep(seconds, value):
+    def provider():
+        time.sleep(seconds)
+        return value
+    return provider
+
+
+def test_waiting_on_one_provider_first_does_not_add_the_deadlines():
+    start = time.monotonic()
+    gathering = context_gather.start({
+        "empresa": (_sleep(0.4, {"score": 80}), 1.0),
+        "forecast": (_sleep(0.4, "dólar estimado"), 1.0),
+    })
+    assert gathering.get("empresa") == {"score": 80}
+    assert gathering.results() == {"empresa": {"score": 80}, "forecast": "dólar estimado"}
+    assert time.monotonic() - start < 0.7
+
+
+def test_late_or_failing_providers_are_missed():
+    def boom():
+        raise RuntimeError("sin datos")
+
+    gathering = context_gather.start({
+        "lento": (_sleep(1.0, "tarde"), 0.1),
+        "falla": (boom, 1.0),
+        "kpis": (_sleep(0, "ok"), 1.0),
+    })
+    assert gathering.get("lento", "omitido") == "omitido"
+    assert gathering.missed("lento") and gathering.missed("falla")
+    assert not gathering.missed("kpis")
+    assert gathering.results() == {"kpis": "ok"}
+
+
+def test_gather_still_blocks_for_all():
+    assert context_gather.gather({"a": (_sleep(0, 1), 1.0), "b": (_sleep(0, 2), 1.0)}) == {"a": 1, "b": 2}
@@ -0,0 +1,92 @@
+import time
+
+import pandas as pd
+import pytest
+
+from modules.direct_answer import DirectAnswerer, default_target, target_date
+from modules.intent_router import route
+
+TODAY = pd.Timestamp("2026-01-15")
+
+
+@pytest.mark.parametrize("question, expected", [
+    ("¿Cuál es la TIIE a 28 días?", None),
+    ("¿cuánto cuestan los cetes a 28 días?", None),
+    ("¿cuánto estarán los cetes en 28 días?", None),
+    ("¿cuánto estará la TIIE a 28 días en 3 meses?", "2026-04-15"),
+    ("¿y el dólar en 28 días?", "2026-02-12"),
+    ("¿a cuánto estará el dólar dentro de dos semanas?", "2026-01-29"),
+    ("¿a cuánto estará el dólar el próximo mes?", "2026-02-15"),
+])
+def test_target_date_ignores_instrument_tenor(question, expected):
+    routed = route(question)
+    target = target_date(routed.text, TODAY, routed.serie)
+    assert target == (pd.Timestamp(expected) if expected else None)
+
+
+def _answerer(calls):
+    def predict_point(serie, *args, **kwargs):
+        calls.append(("forecast", serie, args))
+        return {"ds": TODAY, "yhat": 9.7, "yhat_lower": 9.0, "yhat_upper": 10.4}
+
+    def latest_value(serie):
+        calls.append(("latest", serie))
+        return {"ds": TODAY, "y": 8.9}
+
+    return DirectAnswerer(predict_point, latest_value, lambda: {})
+
+
+def test_tenor_question_gets_current_value():
+    calls = []
+    answer = _answerer(calls).answer("¿Cuál es la TIIE a 28 días?")
+    assert calls == [("latest", "tiie_28d")]
+    assert "8.90%" in answer
+
+
+def test_tenor_without_series_goes_to_llm():
+    calls = []
+    assert _answerer(calls).answer("¿cuánto cuestan los cetes a 91 días?") is None
+    assert calls == []
+
+
+def _forecaster(calls, ds=None):
+    def predict_point(serie, target, **kwargs):
+        calls.append((serie, target))
+        return {"ds": ds if ds is not None else target, "yhat": 9.7, "yhat_lower": 9.0, "yhat_upper": 10.4}
+
+    return DirectAnswerer(predict_point, lambda serie: {}, lambda: {})
+
+
+def test_forecast_without_horizon_is_anchored_to_today():
+    calls = []
+    answer = _forecaster(calls).answer("¿Cuál será la tasa de CETES?")
+    assert calls == [("cetes_28d", default_target())]
+    assert f"{default_target():%d/%m/%Y}" in answer
+
+
+def test_forecast_dated_in_the_past_goes_to_llm():
+    calls = []
+    stale = pd.Timestamp.today().normalize() - pd.DateOffset(months=6)
+    assert _forecaster(calls, ds=stale).answer("¿Cuál será la tasa de CETES?") is None
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize("question", [
+    "¿Cuánto va a subir el dólar si gana Trump?",
+    "¿Cuál será la tasa de referencia en caso de una recesión?",
+])
+def test_conditional_questions_go_to_llm(question):
+    calls = []
+    assert _forecaster(calls).answer(question) is None
+    assert calls == []
+
+
+def test_warm_precomputes_next_month():
+    calls = []
+    answerer = _forecaster(calls)
+    answerer.warm(["tipo_cambio_fix"])
+    for _ in range(50):
+        if calls:
+            break
+        time.sleep(0.01)
+    assert calls == [("tipo_cambio_fix", default_target())]
@@ -0,0 +1,68 @@
+import time
+
+import pytest
+
+from modules.forecast_worker import SUPPORTED, ForecastJobError, ForecastWorkerPool
+
+pytestmark = pytest.mark.skipif(not SUPPORTED, reason="workers de pronóstico solo en POSIX")
+
+MODULE = "tests.test_forecast_worker"
+
+
+def _explode():
+    raise TypeError("no se puede reconstruir")
+
+
+class Unpicklable:
+    """Se serializa en el hijo, pero deserializarlo en el padre lanza TypeError."""
+
+    def __reduce__(self):
+        return _explode, ()
+
+
+def make_unpicklable():
+    return Unpicklable()
+
+
+def add(a, b):
+    return a + b
+
+
+def sleep(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+@pytest.fixture
+def pool():
+    return ForecastWorkerPool(processes=1, timeout=5.0)
+
+
+def test_unpicklable_result_fails_the_job_and_keeps_the_pool(pool):
+    with pytest.raises(ForecastJobError):
+        pool.result(pool.submit(MODULE, "make_unpicklable"))
+    assert pool.result(pool.submit(MODULE, "add", 2, 3)) == 5
+
+
+def test_unpicklable_args_fail_the_job(pool):
+    with pytest.raises(ForecastJobError):
+        pool.result(pool.submit(MODULE, "add", lambda: 1, 2))
+    assert pool.result(pool.submit(MODULE, "add", 1, 1)) == 2
+
+
+def test_timeout_kills_the_worker_and_fails_the_job():
+    pool = ForecastWorkerPool(processes=1, timeout=0.5)
+    start = time.monotonic()
+    with pytest.raises(ForecastJobError):
+        pool.result(pool.submit(MODULE, "sleep", 30))
+    assert time.monotonic() - start < 10
+    assert pool.result(pool.submit(MODULE, "sleep", 0)) == 0
+
+
+def test_result_waits_while_queued():
+    # El segundo trabajo pasa en cola más que timeout + margen, pero no es suyo el retraso
+    pool = ForecastWorkerPool(processes=1, timeout=2.0)
+    ahead = [pool.submit(MODULE, "sleep", 1.2) for _ in range(2)]
+    queued = pool.submit(MODULE, "add", 1, 2)
+    assert pool.result(queued, margin=0.1) == 3
+    assert [pool.result(job) for job in ahead] == [1.2, 1.2]
@@ -0,0 +1,59 @@
+import pytest
+
+from modules.intent_router import route
+
+
+@pytest.mark.parametrize("question, series", [
+    ("¿Cuál es la tasa de CETES a 28 días?", ["cetes_28d"]),
+    ("¿Cuál es la tasa de interés de la TIIE a 91 días?", ["tiie_91d"]),
+    ("¿Qué tasa de fondeo dejó Banxico?", ["tasa_fondeo"]),
+    ("¿Cuál es la tasa de interés?", ["tasa_referencia"]),
+    ("¿Qué hará Banxico con la tasa?", ["tasa_referencia"]),
+    ("¿Cómo afecta la tasa al dólar?", ["tasa_referencia", "tipo_cambio_fix"]),
+    ("Compara la tasa de referencia con los cetes", ["tasa_referencia", "cetes_28d"]),
+    ("¿Cuál es la tasa de desempleo?", ["unemployment_mx_wdi"]),
+])
+def test_generic_rate_aliases_yield_to_specific_series(question, series):
+    assert list(route(question).series) == series
+
+
+def test_longest_alias_wins():
+    assert route("¿a cuánto está el tipo de cambio del euro?").series == ("tipo_cambio_euro",)
+
+
+@pytest.mark.parametrize("question, series", [
+    ("¿Cómo le está yendo a mi negocio?", []),
+    ("¿Cuánto cuesta viajar a Europa?", []),
+    ("¿A cuánto cotiza el yen?", ["usdjpy_frankfurter"]),
+    ("¿Cuántos euros me dan por un dólar?", ["tipo_cambio_euro", "tipo_cambio_fix"]),
+    ("¿Cómo afectaría una subida de tasas a mis ventas?", ["tasa_referencia"]),
+])
+def test_aliases_match_whole_words(question, series):
+    assert list(route(question).series) == series
+
+
+@pytest.mark.parametrize("question", [
+    "¿Cómo está el dólar estadounidense?",
+    "¿Cómo estará el estado del clima?",
+])
+def test_words_inside_other_words_do_not_trigger_business(question):
+    assert not route(question).is_business
+
+
+@pytest.mark.parametrize("question, intent", [
+    ("¿Cómo afectaría la inflación a mi negocio?", "opinion"),
+    ("Explícame los márgenes de mi empresa", "empresa"),
+    ("¿Cuántos CETES conviene comprar?", "dato"),
+    ("¿Cuál es la tasa?", "tasa"),
+])
+def test_stems_still_match_derived_words(question, intent):
+    assert intent in route(question).intents
+
+
+def test_europe_question_is_not_answered_from_a_template():
+    from modules.direct_answer import DirectAnswerer
+
+    calls = []
+    answerer = DirectAnswerer(lambda *a, **k: calls.append(a), lambda s: calls.append(s), dict)
+    assert answerer.answer("¿Cuánto cuesta viajar a Europa?") is None
+    assert calls == []
@@ -0,0 +1,92 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules import prophet_engine
+
+
+class FakeWorkers:
+    """Pool falso: cada trabajo tarda un poco y el primero "guarda" el modelo en disco."""
+
+    enabled = True
+
+    def __init__(self):
+        self.stored = set()
+        self.fits = 0
+        self.jobs = 0
+        self._lock = threading.Lock()
+
+    def submit(self, module, func, serie, df, future, uncertainty, samples):
+        key = prophet_engine._model_key(serie, df)
+        with self._lock:
+            self.jobs += 1
+            if key not in self.stored:
+                self.fits += 1
+        time.sleep(0.2)
+        with self._lock:
+            self.stored.add(key)
+        done = Future()
+        done.set_result((uncertainty, len(future)))
+        return done
+
+    def result(self, job):
+        return job.result()
+
+
+def test_concurrent_requests_fit_each_model_once(monkeypatch):
+    workers = FakeWorkers()
+    monkeypatch.setattr(prophet_engine, "forecast_workers", workers)
+    monkeypatch.setattr(prophet_engine.model_cache, "stored",
+                        lambda key: key in workers.stored)
+
+    df = pd.DataFrame({"ds": pd.date_range("2020-01-31", periods=24, freq="ME"), "y": range(24)})
+    requests = [("none", 1), ("analytic", 1), ("analytic", 3), ("sampled", 6)]
+    with ThreadPoolExecutor(len(requests)) as pool:
+        results = list(pool.map(
+            lambda r: prophet_engine._run_prophet("tiie_28d", df, pd.date_range("2022-01-31", periods=r[1], freq="ME"),
+                                                  r[0], 10),
+            requests,
+        ))
+
+    assert results == requests
+    assert workers.fits == 1
+    assert workers.jobs == len(requests)
+
+
+@pytest.mark.parametrize("value, expected", [
+    (3, 3),
+    (np.int64(6), 6),
+    (None, prophet_engine.DEFAULT_HORIZON),
+    (pd.Timestamp("2026-12-31"), pd.Timestamp("2026-12-31")),
+    (np.datetime64("2026-12-31"), pd.Timestamp("2026-12-31")),
+    ("2026-12-31", pd.Timestamp("2026-12-31")),
+])
+def test_check_target_accepts_steps_and_dates(value, expected):
+    assert prophet_engine._check_target(value, None) == expected
+
+
+@pytest.mark.parametrize("value", [True, False, np.bool_(True), 3.0, "3", "12", "", "mañana", 0])
+def test_check_target_rejects_ambiguous_values(value):
+    with pytest.raises(ValueError):
+        prophet_engine._check_target(value, None)
+
+
+def test_predict_point_rejects_bool_before_forecasting():
+    with pytest.raises(ValueError):
+        prophet_engine.predict_point("tiie_28d", True)
+
+
+@pytest.mark.parametrize("options", [
+    {"backend": "arima"},
+    {"uncertainty": "bootstrap"},
+    {"horizon": 0},
+    {"freq": "cada martes"},
+])
+def test_predict_many_rejects_invalid_request_options_once(options, monkeypatch):
+    monkeypatch.setattr(prophet_engine, "forecast_frame", lambda *a, **k: pytest.fail("no debió pronosticar"))
+    with pytest.raises(ValueError):
+        prophet_engine.predict_many(["tiie_28d", "cetes_28d"], **options)
@@ -0,0 +1,45 @@
+import pytest
+
+from modules.response_cache import ResponseCache, SQLiteStore
+
+# Preguntas que solo difieren en una cifra, una negación o el orden de acciones opuestas
+DISTINCT_PAIRS = [
+    ("¿Qué pasará con el dólar en 3 meses?", "¿Qué pasará con el dólar en 6 meses?"),
+    ("tasa cetes 28 dias", "tasa cetes 91 dias"),
+    ("inflacion 2023", "inflacion 2024"),
+    ("¿conviene comprar dólares?", "¿no conviene comprar dólares?"),
+    ("¿conviene comprar dólares o vender pesos?", "¿conviene vender dólares o comprar pesos?"),
+    ("¿qué pasará con el dólar en tres meses?", "¿qué pasará con el dólar en seis meses?"),
+]
+
+
+@pytest.fixture(params=["memoria", "sqlite"])
+def cache(request, tmp_path):
+    if request.param == "memoria":
+        return ResponseCache()
+    return ResponseCache(store=SQLiteStore(tmp_path / "responses.db"))
+
+
+@pytest.mark.parametrize("cached, asked", DISTINCT_PAIRS)
+def test_hard_tokens_never_share_answer(cache, cached, asked):
+    cache.put(cached, "respuesta original")
+    assert cache.get(asked) is None
+    assert cache.get(cached) == "respuesta original"
+
+
+@pytest.mark.parametrize("cached, asked", DISTINCT_PAIRS)
+def test_hard_tokens_miss_across_processes(tmp_path, cached, asked):
+    ResponseCache(store=SQLiteStore(tmp_path / "responses.db")).put(cached, "respuesta original")
+    assert ResponseCache(store=SQLiteStore(tmp_path / "responses.db")).get(asked) is None
+
+
+def test_near_duplicates_still_hit(cache):
+    cache.put("¿Cómo está el dólar hoy?", "El dólar está en 18.5")
+    assert cache.get("como esta el dolar") == "El dólar está en 18.5"
+    cache.put("¿Qué pasará con el dólar en 6 meses?", "Subiría un poco")
+    assert cache.get("que pasara con el dolar en 6 meses") == "Subiría un poco"
+
+
+def test_scope_isolates_answers(cache):
+    cache.put("¿Cómo va la inflación?", "Baja", scope="kpis:a")
+    assert cache.get("¿Cómo va la inflación?", scope="kpis:b") is None
@@ -7,6 +7,15 @@ import speech_recognition as sr
 from pydub import AudioSegment
 from dotenv import load_dotenv
 import base64
+import sys
+
+# Router de intenciones compartido con el backend: la imagen lo copia junto a
+# este archivo; en local se toma de app/backend/modules
+try:
+    import intent_router
+except ImportError:
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend", "modules"))
+    import intent_router
 
 # ==========================
 # ⚙️ Configuración inicial
@@ -38,28 +47,16 @@ def get_gemini_response(question: str) -> str:
     """Consulta el backend financiero y genera una respuesta con contexto real"""
     forecast_hint = ""
 
-    # Detectar tipo de pregunta y consultar el backend
+    # Detectar la serie que menciona la pregunta y consultar el backend
     try:
-        if "tipo de cambio" in question.lower():
-            r = requests.get(f"{BACKEND_URL}/forecast/tipo_cambio_fix", timeout=10)
-            data = r.json()
-            if isinstance(data, list) and len(data) > 0:
-                last = data[-1]
-                forecast_hint = f"El tipo de cambio se estima en {last['yhat']:.2f} MXN/USD para {last['ds']}."
-
-        elif "tasa" in question.lower():
-            r = requests.get(f"{BACKEND_URL}/forecast/tasa_referencia", timeout=10)
-            data = r.json()
-            if isinstance(data, list) and len(data) > 0:
-                last = data[-1]
-                forecast_hint = f"La tasa de referencia podría ser {last['yhat']:.2f}% para {last['ds']}."
-
-        elif "ipc" in question.lower():
-            r = requests.get(f"{BACKEND_URL}/forecast/ipc_bmv", timeout=10)
+        serie = intent_router.route(question).serie
+        if serie:
+            r = requests.get(f"{BACKEND_URL}/forecast/{serie}", timeout=10)
             data = r.json()
             if isinstance(data, list) and len(data) > 0:
                 last = data[-1]
-                forecast_hint = f"El IPC de la Bolsa Mexicana se estima en {last['yhat']:.2f} puntos para {last['ds']}."
+                forecast_hint = (f"{intent_router.label(serie)} se estima en "
+                                 f"{intent_router.format_value(serie, last['yhat'])} para {last['ds']}.")
     except Exception as e:
         print(f"[Backend Error] {e}")
 